@@ -1,27 +1,270 @@
+import hashlib
+import os
+from datetime import datetime
+
 import streamlit as st
-import pandas as pd
-from data.collector import DataCollector
-from data.processor import DataProcessor
-from visualization.charts import ChartBuilder
+from data.store import DatasetStore
+from data.manifest import SourceManifest, schema_version
+from data.cache import DatasetCache, FigureCache
+from data.jobs import JobRunner
+from data.reporting import StreamlitReporter
+from profiling import Profiler
+
+# pandas, numpy, pyarrow e plotly são importados só quando há dados a carregar
+# ou exibir: a tela inicial abre sem eles (ver tests/test_import_time.py)
+
+# Região analisada (ver data/regions.toml); o RegionRegistry lê a mesma variável
+REGION = os.environ.get('TOURISM_REGION', 'Nordeste')
+
+@st.cache_resource
+def get_dataset_cache():
+    """Cache de datasets compartilhado por todas as sessões do processo"""
+    return DatasetCache()
+
+@st.cache_resource
+def get_figure_cache():
+    """Figuras serializadas compartilhadas por todas as sessões, por versão do dataset e filtros"""
+    return FigureCache()
+
+@st.cache_resource
+def get_job_runner():
+    """Fila de preparação de datasets compartilhada por todas as sessões do processo"""
+    return JobRunner(max_workers=int(os.environ.get('TOURISM_JOB_WORKERS', 1)))
+
+@st.cache_resource
+def get_forecaster():
+    """Modelos de previsão compartilhados entre as sessões, em cache por versão do dataset"""
+    from models.predictor import SeasonalForecaster
+    return SeasonalForecaster(n_jobs=int(os.environ.get('TOURISM_FORECAST_JOBS', 1)))
+
+def build_dataset_entry(data, version, profiler, memory_report=None):
+    """Agrupa o dataset com o cubo de agregados da sua versão"""
+    from data.cube import RollupCube
+    from data.filters import FilterEngine
+    
+    with profiler.stage('cube.build'):
+        cube = RollupCube(data, version=version)
+    # Índices construídos antes de ir para o cache, para entrarem no tamanho medido
+    with profiler.stage('filters.build'):
+        filters = FilterEngine(data).build()
+        cube.filters.build()
+    return {
+        'data': data,
+        'cube': cube,
+        'filters': filters,
+        'version': version,
+        'memory_report': memory_report
+    }
+
+def query_backend():
+    """Backend de consulta: 'pandas' (em memória) ou 'arrow' (store Parquet, fora da memória)"""
+    return os.environ.get('TOURISM_QUERY_BACKEND', 'pandas')
+
+def build_store_entry(store, version, memory_report=None):
+    """Entrada servida direto do store: agregações e linhas lidas em lotes pelo Arrow"""
+    from data.query import ArrowBackend, ArrowRowReader
+    
+    # A versão lê de um snapshot próprio: regravar o store não muda dados já em cache
+    store = store.snapshot(version)
+    return {
+        'data': None,
+        'cube': ArrowBackend(store, version=version),
+        'filters': ArrowRowReader(store),
+        'version': version,
+        'memory_report': memory_report
+    }
+
+def set_dataset(entry):
+    """Aponta a sessão para um dataset (compartilhado via cache, sem cópia)"""
+    st.session_state.consolidated_data = entry['data']
+    st.session_state.cube = entry['cube']
+    st.session_state.filter_engine = entry['filters']
+    st.session_state.dataset_version = entry['version']
+    st.session_state.memory_report = entry['memory_report']
+
+def create_pipeline(profiler, reporter=None):
+    """Coletor e processador, criados só quando algum dado precisa ser gerado ou lido"""
+    from data.collector import DataCollector
+    from data.processor import DataProcessor
+    
+    reporter = reporter or StreamlitReporter()
+    collector = profiler.instrument(DataCollector(reporter), 'collector')
+    processor = profiler.instrument(DataProcessor(reporter), 'processor')
+    return collector, processor
+
+def run_job_pipeline(store_root, reporter, build):
+    """Executa build(collector, processor, store, profiler) dentro de um job
+    
+    Cada job tem o próprio Profiler e store instrumentado (o Profiler do rerun
+    não é compartilhado entre threads); os tempos vão para o log.
+    """
+    profiler = Profiler.from_env()
+    collector, processor = create_pipeline(profiler, reporter)
+    store = profiler.instrument(DatasetStore(store_root), 'store', methods=['read', 'write'])
+    entry = build(collector, processor, store, profiler)
+    profiler.log_records()
+    return entry
+
+def prepare_dataset(runner, cache, key, label, build):
+    """Usa o dataset do cache ou agenda a preparação em segundo plano, sem bloquear a sessão"""
+    entry = cache.get(key)
+    if entry is not None:
+        set_dataset(entry)
+        st.toast(f"✅ {label} carregados!")
+        return
+    # Cliques repetidos e outras sessões com a mesma chave recebem o mesmo job
+    runner.submit(key, lambda reporter: cache.put(key, build(reporter)), label)
+    st.session_state.pending_job = key
+
+def load_stored_dataset(runner, cache, store):
+    """Carrega o dataset gravado em disco, passando pelo cache do processo"""
+    key = cache.key('store', root=str(store.root), backend=query_backend(), **store.signature())
+    version = hashlib.sha256(repr(key).encode('utf-8')).hexdigest()[:16]
+    
+    def build(collector, processor, store, profiler):
+        if query_backend() == 'arrow':
+            return build_store_entry(store, version)
+        return build_dataset_entry(processor.apply_schema(store.read()), version, profiler)
+    
+    prepare_dataset(
+        runner, cache, key, "Dados gravados",
+        lambda reporter: run_job_pipeline(store.root, reporter, build)
+    )
+
+def load_sample_dataset(runner, cache, store, params, label, generate):
+    """Carrega os dados de exemplo: do cache, do store ou gerando novamente (generate(collector))"""
+    manifest = SourceManifest(store.manifest_path)
+    version = manifest.params_hash(params)[:16]
+    
+    def build(collector, processor, store, profiler):
+        manifest = SourceManifest(store.manifest_path)
+        if store.exists() and manifest.matches_generated('SAMPLE_DATA', params, processor.schema_version):
+            if query_backend() == 'arrow':
+                return build_store_entry(store, version)
+            return build_dataset_entry(processor.apply_schema(store.read()), version, profiler)
+        
+        datasets = generate(collector)
+        consolidated_data = processor.consolidate_data(datasets)
+        if consolidated_data.empty:
+            # Nada a gravar: o store anterior fica como está e o job termina com o erro
+            raise ValueError("Nenhum dado foi consolidado. Verifique a estrutura dos dados.")
+        store.write(consolidated_data)
+        
+        # A gravação completa substitui o store, então o manifesto recomeça
+        new_manifest = SourceManifest(store.manifest_path)
+        new_manifest.record_generated('SAMPLE_DATA', params, len(consolidated_data), processor.schema_version)
+        new_manifest.save()
+        if query_backend() == 'arrow':
+            return build_store_entry(store, version, processor.last_memory_report)
+        return build_dataset_entry(consolidated_data, version, profiler, processor.last_memory_report)
+    
+    prepare_dataset(
+        runner, cache, cache.key('sample', backend=query_backend(), **params), label,
+        lambda reporter: run_job_pipeline(store.root, reporter, build)
+    )
+
+def collect_finished_job(runner):
+    """Aplica o dataset do job da sessão quando ele termina; até lá a sessão segue com o anterior"""
+    key = st.session_state.get('pending_job')
+    if key is None:
+        return
+    job = runner.get(key)
+    if job is not None and not job.done:
+        return
+    
+    del st.session_state.pending_job
+    if job is None:
+        return
+    if job.error is not None:
+        st.error(f"❌ Falha ao preparar os dados ({job.label}): {job.error}")
+    else:
+        set_dataset(job.result())
+        st.toast(f"✅ {job.label} carregados!")
+
+@st.fragment(run_every=1)
+def render_job_status(runner):
+    """Progresso do job da sessão, atualizado a cada segundo sem rerodar a página inteira"""
+    key = st.session_state.get('pending_job')
+    job = runner.get(key) if key is not None else None
+    if job is None or job.done:
+        # Rerun completo: collect_finished_job troca o dataset da sessão
+        st.rerun(scope='app')
+    
+    text = job.text or ('Na fila...' if job.status == 'na fila' else 'Preparando...')
+    st.progress(job.fraction, text=f"⏳ {job.label}: {text}")
+    if job.messages:
+        st.caption(job.messages[-1][1])
+
+def get_drilldown(cube, filters):
+    """Drill-down da sessão, refeito só quando o dataset ou os filtros cruzados mudam"""
+    from data.drilldown import DrillDown
+    from data.query import Aggregation
+    
+    key = (st.session_state.dataset_version, Aggregation([], filters).key())
+    cached = st.session_state.get('drilldown')
+    if cached is None or cached[0] != key:
+        st.session_state.drilldown = (key, DrillDown(cube, filters=filters))
+    return st.session_state.drilldown[1]
+
+def render_performance_panel(profiler):
+    """Painel opcional na sidebar com os tempos por etapa do rerun atual"""
+    if not profiler.enabled:
+        return
+    
+    profiler.log_records()
+    prometheus_path = os.environ.get('TOURISM_PROFILING_PROM')
+    if prometheus_path:
+        profiler.write_prometheus(prometheus_path)
+    
+    with st.sidebar.expander("⏱️ Performance", expanded=False):
+        records = profiler.summary()
+        if not records:
+            st.caption("Nenhuma etapa medida neste rerun.")
+            return
+        
+        import pandas as pd
+        
+        table = pd.DataFrame(records).sort_values('seconds', ascending=False)
+        table['seconds'] = table['seconds'].round(4)
+        table['self_seconds'] = table['self_seconds'].round(4)
+        st.dataframe(table.set_index('stage'), use_container_width=True)
+        st.download_button(
+            label="📄 Métricas (Prometheus)",
+            data=profiler.to_prometheus(),
+            file_name="tourism_metrics.prom",
+            mime="text/plain"
+        )
 
 def main():
     st.set_page_config(
-        page_title="Análise de Turismo - Nordeste",
+        page_title=f"Análise de Turismo - {REGION}",
         page_icon="🇧🇷",
         layout="wide"
     )
     
-    st.title("🏖️ Análise de Dados de Turismo - Região Nordeste")
-    st.markdown("""
-    ### Estudo de caso sobre fluxo de turistas internacionais no Nordeste brasileiro
+    st.title(f"🏖️ Análise de Dados de Turismo - Região {REGION}")
+    st.markdown(f"""
+    ### Estudo de caso sobre fluxo de turistas internacionais na região {REGION}
     
     **💡 Esta é uma demonstração com dados simulados** que replicam os padrões reais do turismo na região.
     """)
     
-    # Inicialização dos módulos
-    collector = DataCollector()
-    processor = DataProcessor()
-    charts = ChartBuilder()
+    # Inicialização dos módulos (instrumentados apenas com TOURISM_PROFILING=1)
+    profiler = Profiler.from_env()
+    store = profiler.instrument(DatasetStore(), 'store', methods=['read', 'write'])
+    cache = get_dataset_cache()
+    runner = get_job_runner()
+    
+    # Dataset de um job concluído desde o último rerun
+    collect_finished_job(runner)
+    
+    # Reaproveita o último dataset gravado em disco em vez de gerar novamente,
+    # desde que tenha sido gravado com o esquema atual para a região ativa
+    if (
+        'consolidated_data' not in st.session_state and 'pending_job' not in st.session_state
+        and store.exists() and SourceManifest(store.manifest_path).matches_schema(schema_version(REGION))
+    ):
+        load_stored_dataset(runner, cache, store)
     
     # Sidebar
     st.sidebar.title("🎯 Configurações")
@@ -34,37 +277,61 @@ def main():
     
     col1, col2 = st.sidebar.columns(2)
     
+    # A preparação roda em segundo plano: a página segue com os dados atuais até o job terminar
     with col1:
         if st.button("⚡ Dados Rápidos", use_container_width=True):
-            with st.spinner("Gerando dados de exemplo..."):
-                datasets = collector.get_sample_data_quick()
-                st.session_state.datasets = datasets
-                consolidated_data = processor.consolidate_data(datasets)
-                st.session_state.consolidated_data = consolidated_data
-                st.success("✅ Dados rápidos carregados!")
+            load_sample_dataset(
+                runner, cache, store, {'modo': 'rapido', 'regiao': REGION}, "Dados rápidos",
+                lambda collector: collector.get_sample_data_quick()
+            )
     
     with col2:
         if st.button("📊 Dados Completos", use_container_width=True):
-            with st.spinner("Gerando dados detalhados... (isso pode levar alguns segundos)"):
-                datasets = collector.generate_sample_data(years=5)
-                st.session_state.datasets = datasets
-                consolidated_data = processor.consolidate_data(datasets)
-                st.session_state.consolidated_data = consolidated_data
-                st.success("✅ Dados completos carregados!")
+            load_sample_dataset(
+                runner, cache, store, {'modo': 'completo', 'anos': 5, 'seed': 42, 'regiao': REGION}, "Dados completos",
+                lambda collector: collector.generate_sample_data(years=5, seed=42)
+            )
+    
+    if 'pending_job' in st.session_state:
+        with st.sidebar:
+            render_job_status(runner)
     
     st.sidebar.markdown("---")
-    st.sidebar.info("""
+    st.sidebar.info(f"""
     **Sobre os dados:**
     - 📅 Período: 2019-2023
-    - 🗺️ Estados do Nordeste
+    - 🗺️ Estados da região {REGION}
     - ✈️ Dados de chegadas internacionais
     - 🎲 Dados simulados com padrões realistas
     """)
     
+    memory_report = st.session_state.get('memory_report')
+    if memory_report:
+        reduction = 1 - memory_report['depois'] / max(memory_report['antes'], 1)
+        st.sidebar.caption(
+            f"💾 Memória: {memory_report['antes'] / 1e6:,.1f} MB → "
+            f"{memory_report['depois'] / 1e6:,.1f} MB ({reduction:.0%} menor)"
+        )
+    
+    cache_stats = cache.stats()
+    st.sidebar.caption(
+        f"🗄️ Cache: {cache_stats['hits']} acertos / {cache_stats['misses']} faltas "
+        f"({cache_stats['hit_rate']:.0%}), {cache_stats['bytes'] / 2**20:,.1f} de "
+        f"{cache_stats['max_bytes'] / 2**20:,.0f} MB"
+    )
+    
+    figure_stats = get_figure_cache().stats()
+    if figure_stats['hits'] + figure_stats['misses']:
+        st.sidebar.caption(
+            f"🖼️ Gráficos: {figure_stats['hits']} acertos / {figure_stats['misses']} faltas "
+            f"({figure_stats['hit_rate']:.0%}), {figure_stats['entries']} figuras em "
+            f"{figure_stats['bytes'] / 2**20:,.1f} MB"
+        )
+    
     # Verifica se os dados estão carregados
     if 'consolidated_data' not in st.session_state:
-        st.info("""
-        ## 👋 Bem-vindo à Análise de Turismo do Nordeste!
+        st.info(f"""
+        ## 👋 Bem-vindo à Análise de Turismo da região {REGION}!
         
         **Para começar, escolha uma opção na sidebar:**
         
@@ -83,21 +350,47 @@ def main():
         
         # Mostrar preview dos dados
         st.subheader("📋 Preview da Estrutura de Dados")
-        sample_preview = pd.DataFrame({
-            'Ano': [2023, 2023, 2022, 2022],
-            'Mês': ['janeiro', 'julho', 'dezembro', 'junho'],
-            'UF': ['Bahia', 'Pernambuco', 'Ceará', 'Rio Grande do Norte'],
-            'País': ['Argentina', 'Portugal', 'Estados Unidos', 'França'],
-            'Continente': ['América', 'Europa', 'América', 'Europa'],
-            'Via de acesso': ['Aérea', 'Aérea', 'Terrestre', 'Marítima'],
-            'Chegadas': [150, 280, 90, 45]
-        })
-        st.dataframe(sample_preview, use_container_width=True)
+        # Tabela em markdown: a tela inicial não precisa carregar o pandas
+        st.markdown("""
+        | Ano | Mês | UF | País | Continente | Via de acesso | Chegadas |
+        |---|---|---|---|---|---|---:|
+        | 2023 | janeiro | Bahia | Argentina | América | Aérea | 150 |
+        | 2023 | julho | Pernambuco | Portugal | Europa | Aérea | 280 |
+        | 2022 | dezembro | Ceará | Estados Unidos | América | Terrestre | 90 |
+        | 2022 | junho | Rio Grande do Norte | França | Europa | Marítima | 45 |
+        """)
         
+        render_performance_panel(profiler)
         return
     
     # Dados carregados - mostrar análise
-    data = st.session_state.consolidated_data
+    from data.export import DatasetExporter
+    from data.regions import RegionRegistry
+    from visualization.charts import ChartBuilder
+    from visualization.payload import page_count, page_slice
+    
+    charts = profiler.instrument(
+        ChartBuilder(region=RegionRegistry().region), 'charts',
+        methods=[name for name in dir(ChartBuilder) if name.startswith('create_')] + ['_aggregate']
+    )
+    exporter = DatasetExporter()
+    forecaster = get_forecaster()
+    
+    figures = get_figure_cache()
+    
+    def show_chart(chart, data, element_key=None, **params):
+        """Envia o gráfico ao navegador; a mesma versão, gráfico e filtros reaproveitam a figura em cache
+        
+        `element_key` distingue o mesmo gráfico exibido em mais de uma aba.
+        """
+        key = figures.key(st.session_state.dataset_version, chart, **params)
+        fig = figures.get_or_build(key, lambda: getattr(charts, chart)(data))
+        if fig:
+            with profiler.stage('st.plotly_chart'):
+                st.plotly_chart(fig, use_container_width=True, key=element_key)
+    
+    cube = st.session_state.cube
+    filter_engine = st.session_state.filter_engine
     
     # Métricas rápidas no topo
     st.subheader("📈 Métricas Principais")
@@ -105,61 +398,54 @@ def main():
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_tourists = data['Chegadas'].sum()
+        total_tourists = cube.total()
         st.metric("Total de Turistas", f"{total_tourists:,.0f}")
     
     with col2:
-        years_covered = f"{data['Ano'].min()} - {data['Ano'].max()}"
+        min_year, max_year = cube.year_range()
+        years_covered = f"{min_year} - {max_year}"
         st.metric("Período", years_covered)
     
     with col3:
-        states_covered = data['UF'].nunique()
+        states_covered = cube.nunique('UF')
         st.metric("Estados", states_covered)
     
     with col4:
-        avg_per_year = int(data.groupby('Ano')['Chegadas'].sum().mean())
+        avg_per_year = int(cube.rollup(['Ano'])['Chegadas'].mean())
         st.metric("Média/Ano", f"{avg_per_year:,.0f}")
     
     # Abas para organização
-    tab1, tab2, tab3, tab4 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
         "📊 Visão Geral", 
         "🗺️ Análise Geográfica", 
         "📈 Tendências Temporais", 
-        "🔍 Dados Detalhados"
+        "🔍 Dados Detalhados",
+        "🔮 Previsões",
+        "🧭 Drill-down"
     ])
     
     with tab1:
-        st.header("Visão Geral do Turismo no Nordeste")
+        st.header(f"Visão Geral do Turismo na região {REGION}")
         
         # Gráfico de tendência
-        trend_chart = charts.create_trend_chart(data)
-        if trend_chart:
-            st.plotly_chart(trend_chart, use_container_width=True)
+        show_chart('create_trend_chart', cube)
         
         # Distribuição por continente
         col1, col2 = st.columns(2)
         
         with col1:
-            continent_chart = charts.create_continent_chart(data)
-            if continent_chart:
-                st.plotly_chart(continent_chart, use_container_width=True)
+            show_chart('create_continent_chart', cube)
         
         with col2:
-            via_chart = charts.create_transport_chart(data)
-            if via_chart:
-                st.plotly_chart(via_chart, use_container_width=True)
+            show_chart('create_transport_chart', cube)
     
     with tab2:
         st.header("Análise Geográfica")
         
-        states_chart = charts.create_top_states_chart(data)
-        if states_chart:
-            st.plotly_chart(states_chart, use_container_width=True)
+        show_chart('create_top_states_chart', cube)
         
         # Mapa de calor por mês e estado
-        heatmap_chart = charts.create_heatmap_chart(data)
-        if heatmap_chart:
-            st.plotly_chart(heatmap_chart, use_container_width=True)
+        show_chart('create_heatmap_chart', cube)
     
     with tab3:
         st.header("Tendências Temporais")
@@ -167,25 +453,52 @@ def main():
         # Filtro por ano
         year_range = st.slider(
             "Selecione o intervalo de anos:",
-            min_value=int(data['Ano'].min()),
-            max_value=int(data['Ano'].max()),
-            value=(int(data['Ano'].min()), int(data['Ano'].max()))
+            min_value=min_year,
+            max_value=max_year,
+            value=(min_year, max_year)
         )
         
-        filtered_data = data[(data['Ano'] >= year_range[0]) & (data['Ano'] <= year_range[1])]
+        filters = {'Ano': year_range}
+        filter_options = [
+            ('UF', "Estados:"),
+            ('País', "Países de origem:"),
+            ('Via de acesso', "Vias de acesso:")
+        ]
+        filter_columns = st.columns(len(filter_options))
+        for filter_column, (column, label) in zip(filter_columns, filter_options):
+            if column in cube.dimensions:
+                with filter_column:
+                    selected = st.multiselect(label, cube.values(column))
+                filters[column] = selected or None
+        
+        # Os índices do cubo respondem ao filtro sobre os grupos, não sobre as linhas brutas
+        filtered_data = cube.select(filters)
         
         if not filtered_data.empty:
-            st.write(f"**Dados de {year_range[0]} a {year_range[1]}:** {filtered_data['Chegadas'].sum():,} chegadas no período")
+            st.write(f"**Dados de {year_range[0]} a {year_range[1]}:** {filtered_data.total():,} chegadas no período")
             
             # Análise mensal
-            monthly_chart = charts.create_monthly_trend_chart(filtered_data)
-            if monthly_chart:
-                st.plotly_chart(monthly_chart, use_container_width=True)
+            show_chart('create_monthly_trend_chart', filtered_data, filters=filters)
     
     with tab4:
         st.header("Dados Detalhados")
         
-        st.dataframe(data, use_container_width=True)
+        # Mesmos filtros da aba Tendências Temporais, via índices sobre as linhas brutas
+        total_rows = filter_engine.count(filters)
+        st.caption(f"{total_rows:,} de {filter_engine.count({}):,} registros (filtros da aba Tendências Temporais)")
+        
+        # Paginação no servidor: só as linhas da página atual são enviadas ao navegador
+        col1, col2 = st.columns(2)
+        with col1:
+            page_size = st.selectbox("Linhas por página:", [50, 100, 500, 1000], index=1)
+        total_pages = page_count(total_rows, page_size)
+        with col2:
+            page = st.number_input(
+                f"Página (de {total_pages:,}):",
+                min_value=1, max_value=total_pages, value=1, step=1
+            )
+        page_rows = filter_engine.select(filters, rows=page_slice(page, page_size, total_rows))
+        st.dataframe(page_rows, use_container_width=True)
         
         # Estatísticas
         st.subheader("📋 Estatísticas Descritivas")
@@ -193,23 +506,125 @@ def main():
         
         with col1:
             st.write("**Chegadas por Ano:**")
-            yearly_stats = data.groupby('Ano')['Chegadas'].sum()
+            yearly_stats = cube.rollup(['Ano']).set_index('Ano')['Chegadas']
             st.dataframe(yearly_stats)
         
         with col2:
             st.write("**Chegadas por Estado:**")
-            state_stats = data.groupby('UF')['Chegadas'].sum().sort_values(ascending=False)
+            state_stats = cube.rollup(['UF']).set_index('UF')['Chegadas'].sort_values(ascending=False)
             st.dataframe(state_stats)
         
-        # Download
+        # Exportação em blocos para arquivo, reaproveitada por versão do dataset e filtro
         st.subheader("📥 Exportar Dados")
-        csv = data.to_csv(index=False)
-        st.download_button(
-            label="💾 Download CSV",
-            data=csv,
-            file_name=f"turismo_nordeste_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv"
+        export_format = st.selectbox(
+            "Formato:",
+            list(exporter.formats),
+            format_func=lambda fmt: exporter.formats[fmt]['label']
+        )
+        dataset_version = st.session_state.dataset_version
+        artifact = exporter.cached_path(dataset_version, filters, export_format)
+        if artifact is not None:
+            st.caption(f"Arquivo já gerado para estes filtros ({artifact.stat().st_size / 2**20:,.1f} MB)")
+        
+        # O arquivo só é lido para a memória no rerun em que o download é pedido,
+        # e o clique no download não dispara outro rerun (on_click='ignore')
+        if st.button("📦 Preparar download"):
+            if artifact is None:
+                with st.spinner("Gerando arquivo em blocos..."):
+                    artifact = exporter.export(filter_engine, filters, dataset_version, export_format)
+            export_info = exporter.formats[export_format]
+            st.download_button(
+                label=f"💾 Download {export_info['label']}",
+                data=artifact.read_bytes(),
+                file_name=f"turismo_{REGION.lower()}_{datetime.now().strftime('%Y%m%d')}{export_info['extension']}",
+                mime=export_info['mime'],
+                on_click='ignore'
+            )
+    
+    with tab5:
+        st.header("Previsões")
+        st.caption(
+            f"Tendência e sazonalidade mensal ajustadas por série "
+            f"({' x '.join(forecaster.series_keys)}) para os próximos {forecaster.horizon} meses"
+        )
+        
+        # Todas as séries são ajustadas de uma vez e reaproveitadas enquanto o dataset for o mesmo
+        with profiler.stage('forecast.fit'):
+            model = forecaster.fit(cube, version=st.session_state.dataset_version)
+        
+        forecast_filters = {}
+        forecast_options = [('UF', "Estados:"), ('Via de acesso', "Vias de acesso:")]
+        filter_columns = st.columns(len(forecast_options))
+        for filter_column, (column, label) in zip(filter_columns, forecast_options):
+            if column in model.series.columns:
+                with filter_column:
+                    forecast_filters[column] = st.multiselect(
+                        label, cube.values(column), key=f"forecast_{column}"
+                    )
+        
+        show_chart('create_forecast_chart', model.frame(forecast_filters), filters=forecast_filters)
+        
+        st.subheader("📋 Séries com maior previsão")
+        st.dataframe(
+            model.summary(forecast_filters, top=20).style.format(
+                {'Últimos 12 meses': '{:,.0f}', 'Previsão': '{:,.0f}', 'Variação': '{:+.1%}'}
+            ),
+            use_container_width=True
+        )
+    
+    with tab6:
+        st.header("Drill-down")
+        st.caption(
+            "Escolha um valor em cada nível para descer na hierarquia; "
+            "os gráficos abaixo seguem o caminho escolhido"
         )
+        
+        # Filtros cruzados: mudá-los refaz a consulta; o caminho só recorta os agregados já prontos
+        drill_filters = {}
+        col1, col2 = st.columns(2)
+        with col1:
+            drill_filters['Ano'] = st.slider(
+                "Anos:", min_value=min_year, max_value=max_year, value=(min_year, max_year), key='drill_Ano'
+            )
+        if 'Via de acesso' in cube.dimensions:
+            with col2:
+                drill_filters['Via de acesso'] = st.multiselect(
+                    "Vias de acesso:", cube.values('Via de acesso'), key='drill_Via de acesso'
+                ) or None
+        drill = get_drilldown(cube, drill_filters)
+        
+        path = []
+        path_columns = st.columns(len(drill.hierarchy))
+        for path_column, level in zip(path_columns, drill.hierarchy):
+            with path_column:
+                choice = st.selectbox(
+                    f"{level}:", ['(todos)'] + list(drill.children(path)[level]), key=f"drill_{level}"
+                )
+            if choice == '(todos)':
+                break
+            path.append(choice)
+        
+        path_filters = drill.cross_filters(path)
+        st.write(f"**{' → '.join(['Todos'] + [str(value) for value in path])}:** {drill.total(path):,} chegadas")
+        
+        if len(path) < len(drill.hierarchy):
+            children = drill.children(path)
+            show_chart('create_drilldown_chart', children, filters=path_filters)
+            st.dataframe(
+                children.style.format({'Chegadas': '{:,.0f}', 'Participação': '{:.1%}'}),
+                use_container_width=True,
+                hide_index=True
+            )
+        
+        # Filtro cruzado: o caminho restringe também as demais dimensões
+        path_cube = cube.select(path_filters)
+        col1, col2 = st.columns(2)
+        with col1:
+            show_chart('create_transport_chart', path_cube, element_key='drill_transport', filters=path_filters)
+        with col2:
+            show_chart('create_trend_chart', path_cube, element_key='drill_trend', filters=path_filters)
+    
+    render_performance_panel(profiler)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
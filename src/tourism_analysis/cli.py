@@ -0,0 +1,206 @@
+"""Execução em lote do pipeline, sem Streamlit: coleta → consolidação → agregação → exportação
+
+Pensado para pré-calcular os dados em workers sem servidor web (ex.: cron noturno):
+
+    tourism-analysis --modo completo --saida relatorio
+    tourism-analysis --arquivos dados/ --formatos csv.gz parquet --graficos html
+"""
+import argparse
+import hashlib
+import importlib.util
+import logging
+import os
+import sys
+from pathlib import Path
+
+from .data.export import DatasetExporter
+from .data.manifest import SourceManifest
+from .data.reporting import Reporter
+from .data.store import DatasetStore
+from .profiling import Profiler
+
+logger = logging.getLogger('tourism_analysis')
+
+# Agregados gravados pelo passo de agregação: nome do arquivo -> chaves do rollup
+AGGREGATES = {
+    'por_ano': ['Ano'],
+    'por_uf': ['UF'],
+    'por_ano_mes': ['Ano', 'Mês'],
+    'por_uf_mes': ['UF', 'Mês'],
+    'por_continente': ['Continente'],
+    'por_pais': ['País'],
+    'por_via_de_acesso': ['Via de acesso']
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='tourism-analysis',
+        description='Gera o dataset, os agregados e as exportações do turismo de uma região em lote.'
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        '--modo', choices=['rapido', 'completo'], default='completo',
+        help='dados de exemplo a gerar (padrão: completo)'
+    )
+    source.add_argument(
+        '--arquivos', type=Path,
+        help='diretório com os CSVs anuais (ex.: CHEGADAS_2019.csv), processados de forma incremental'
+    )
+    parser.add_argument(
+        '--regiao', default=os.environ.get('TOURISM_REGION', 'Nordeste'),
+        help='região analisada, definida em data/regions.toml (padrão: TOURISM_REGION ou Nordeste)'
+    )
+    parser.add_argument('--anos', type=int, default=5, help='anos de dados de exemplo (modo completo)')
+    parser.add_argument('--registros', type=int, help='quantidade de registros de exemplo (modo completo)')
+    parser.add_argument('--seed', type=int, default=42, help='semente dos dados de exemplo')
+    parser.add_argument('--workers', type=int, default=1, help='processos para ler os CSVs anuais (1 grava cada arquivo em blocos, sem carregá-lo inteiro)')
+    parser.add_argument('--store', type=Path, help='diretório do store Parquet (padrão: TOURISM_DATA_DIR)')
+    parser.add_argument('--saida', type=Path, default=Path('relatorio'), help='diretório dos resultados')
+    parser.add_argument(
+        '--formatos', nargs='*', default=['csv.gz'], choices=list(DatasetExporter.formats),
+        help='formatos da exportação completa (padrão: csv.gz; vazio para não exportar)'
+    )
+    parser.add_argument(
+        '--graficos', choices=['html', 'png'],
+        help='também grava os gráficos (png requer o pacote kaleido)'
+    )
+    parser.add_argument('--perfil', action='store_true', help='registra no log o tempo de cada etapa')
+    parser.add_argument('-v', '--verbose', action='store_true', help='log detalhado')
+    return parser
+
+
+def collect(args, collector, processor, store):
+    """Atualiza o store a partir dos CSVs ou dos dados de exemplo e retorna a versão do dataset"""
+    manifest = SourceManifest(store.manifest_path)
+
+    if args.arquivos is not None:
+        files = {path.stem: path for path in sorted(args.arquivos.glob('*.csv'))}
+        if not files:
+            raise SystemExit(f"Nenhum CSV encontrado em {args.arquivos}")
+
+        # Dados de exemplo no store não têm ano de origem: recomeça do zero
+        if any(entry['path'] is None for entry in manifest.sources.values()):
+            store.drop_years(store.available_years())
+            store.manifest_path.unlink(missing_ok=True)
+
+        years = processor.refresh_store(files, store, workers=args.workers)
+        if years:
+            logger.info(f"Anos reprocessados: {', '.join(map(str, years))}")
+        else:
+            logger.info("Nenhum arquivo mudou desde a última execução")
+        return hashlib.sha256(repr(sorted(store.signature().items())).encode('utf-8')).hexdigest()[:16]
+
+    if args.modo == 'rapido':
+        params = {'modo': 'rapido', 'regiao': args.regiao}
+        generate = collector.get_sample_data_quick
+    else:
+        params = {'modo': 'completo', 'anos': args.anos, 'seed': args.seed, 'regiao': args.regiao}
+        if args.registros is not None:
+            params['registros'] = args.registros
+        generate = lambda: collector.generate_sample_data(years=args.anos, records=args.registros, seed=args.seed)
+
+    if store.exists() and manifest.matches_generated('SAMPLE_DATA', params, processor.schema_version):
+        logger.info("Dados de exemplo já estão no store; geração ignorada")
+    else:
+        data = processor.consolidate_data(generate())
+        if data.empty:
+            raise SystemExit("Nenhum dado foi consolidado. Verifique a estrutura dos dados.")
+        store.write(data)
+        # A gravação completa substitui o store, então o manifesto recomeça
+        manifest = SourceManifest(store.manifest_path)
+        manifest.record_generated('SAMPLE_DATA', params, len(data), processor.schema_version)
+        manifest.save()
+    return manifest.params_hash(params)[:16]
+
+
+def write_aggregates(cube, directory):
+    """Grava a tabela base do cubo e os rollups usados pelos gráficos"""
+    directory.mkdir(parents=True, exist_ok=True)
+    cube.base.to_parquet(directory / 'base.parquet', index=False)
+    for name, keys in AGGREGATES.items():
+        if all(key in cube.dimensions for key in keys):
+            cube.rollup(keys).to_parquet(directory / f'{name}.parquet', index=False)
+
+
+def write_charts(cube, directory, fmt, reporter, region=None):
+    """Grava os gráficos do painel como HTML interativo ou PNG"""
+    if fmt == 'png' and importlib.util.find_spec('kaleido') is None:
+        reporter.warning("Pacote kaleido não instalado: gráficos PNG ignorados")
+        return
+
+    # Importado só aqui: o plotly não é necessário para o restante do pipeline
+    from .visualization.charts import ChartBuilder
+
+    charts = ChartBuilder(region=region)
+    directory.mkdir(parents=True, exist_ok=True)
+    for name in dir(charts):
+        if not name.startswith('create_') or name in ('create_forecast_chart', 'create_drilldown_chart'):
+            continue
+        fig = getattr(charts, name)(cube)
+        path = directory / f"{name.removeprefix('create_')}.{fmt}"
+        if fmt == 'html':
+            fig.write_html(path, include_plotlyjs='cdn')
+        else:
+            fig.write_image(path)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    # O pipeline (pandas/numpy) só é importado depois de validar os argumentos
+    from .data.collector import DataCollector
+    from .data.cube import RollupCube
+    from .data.filters import FilterEngine
+    from .data.processor import DataProcessor
+    from .data.regions import RegionRegistry
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+    )
+
+    profiler = Profiler(enabled=args.perfil)
+    reporter = Reporter()
+    try:
+        regions = RegionRegistry(args.regiao)
+    except ValueError as error:
+        reporter.error(str(error))
+        return 2
+    collector = profiler.instrument(DataCollector(reporter, regions), 'collector')
+    processor = profiler.instrument(DataProcessor(reporter, regions), 'processor')
+    store = profiler.instrument(DatasetStore(args.store), 'store', methods=['read', 'write'])
+
+    with profiler.stage('coleta'):
+        version = collect(args, collector, processor, store)
+
+    if not store.exists():
+        reporter.error("Store vazio: nada a agregar ou exportar")
+        return 1
+
+    with profiler.stage('consolidacao'):
+        data = processor.apply_schema(store.read())
+    logger.info(f"Dataset {version}: {len(data):,} registros")
+
+    with profiler.stage('agregacao'):
+        cube = RollupCube(data, version=version)
+        write_aggregates(cube, args.saida / 'agregados')
+
+    with profiler.stage('exportacao'):
+        exporter = DatasetExporter(args.saida)
+        engine = FilterEngine(data)
+        for fmt in args.formatos:
+            file_name = f"turismo_{args.regiao.lower()}{exporter.formats[fmt]['extension']}"
+            path = exporter.write(engine, {}, fmt, args.saida / file_name)
+            logger.info(f"Exportado: {path}")
+
+    if args.graficos:
+        with profiler.stage('graficos'):
+            write_charts(cube, args.saida / 'graficos', args.graficos, reporter, regions.region)
+
+    profiler.log_records()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
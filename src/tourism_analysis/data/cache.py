@@ -0,0 +1,187 @@
+import os
+import sys
+import threading
+
+from cachetools import LRUCache
+
+
+class _CountingLRUCache(LRUCache):
+    """LRUCache que conta quantos itens foram descartados por falta de espaço"""
+
+    def __init__(self, maxsize, getsizeof=None):
+        super().__init__(maxsize, getsizeof)
+        self.evictions = 0
+
+    def popitem(self):
+        self.evictions += 1
+        return super().popitem()
+
+
+class DatasetCache:
+    """Cache de processo para datasets consolidados e agregados derivados
+
+    Compartilhado entre as sessões do Streamlit: cada chave de parâmetros é
+    calculada uma vez e os itens menos usados saem quando o orçamento de
+    memória (TOURISM_CACHE_MB, padrão 512 MB) é excedido.
+    """
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(os.environ.get('TOURISM_CACHE_MB', 512)) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self._cache = _CountingLRUCache(maxsize=max_bytes, getsizeof=self.size_of)
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(mode, years=None, seed=None, files=None, **params):
+        """Monta a chave a partir dos parâmetros do dataset
+
+        Arquivos de origem entram com caminho, mtime e tamanho, de modo que
+        qualquer alteração gera uma chave nova.
+        """
+        sources = ()
+        if files:
+            sources = tuple(
+                (name, str(path), os.stat(path).st_mtime, os.stat(path).st_size)
+                for name, path in sorted(files.items())
+            )
+        return (mode, years, seed, sources, tuple(sorted(params.items())))
+
+    @classmethod
+    def size_of(cls, value):
+        """Memória estimada de um item do cache, em bytes"""
+        if hasattr(value, 'memory_usage'):
+            # DataFrame/Series (verificado pelo atributo para não importar o pandas)
+            return int(value.memory_usage(deep=True).sum())
+        if isinstance(value, dict):
+            return sum(cls.size_of(item) for item in value.values())
+        if isinstance(value, (list, tuple)):
+            return sum(cls.size_of(item) for item in value)
+        if hasattr(value, 'nbytes'):
+            # RollupCube (base, rollups e índices), FilterEngine (índices) e arrays
+            return int(value.nbytes)
+        return sys.getsizeof(value)
+
+    def get(self, key):
+        """Retorna o item em cache ou None
+
+        Índices e rollups criados depois do put aumentam o item; a cada acesso
+        ele é medido de novo, e o orçamento descarta outros itens se preciso.
+        """
+        with self._lock:
+            value = self._cache.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if self._cache.getsizeof(value) <= self.max_bytes:
+                self._cache[key] = value
+            else:
+                del self._cache[key]
+            return value
+
+    def put(self, key, value):
+        """Guarda o item; itens maiores que o orçamento inteiro não são guardados"""
+        with self._lock:
+            if self._cache.getsizeof(value) <= self.max_bytes:
+                self._cache[key] = value
+        return value
+
+    def get_or_compute(self, key, compute):
+        """Retorna o item em cache ou calcula, guarda e retorna"""
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        """Esvazia o cache (as estatísticas são mantidas)"""
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self):
+        """Estatísticas de uso: acertos, faltas, descartes e ocupação"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / requests if requests else 0.0,
+                'evictions': self._cache.evictions,
+                'entries': len(self._cache),
+                'bytes': self._cache.currsize,
+                'max_bytes': self.max_bytes
+            }
+
+
+class FigureCache:
+    """Cache de processo para figuras do Plotly, guardadas serializadas em JSON
+
+    A chave combina a versão do dataset, o gráfico e os parâmetros (filtros)
+    que o definem; reruns que não mudam nada disso recuperam a figura do JSON
+    em vez de montá-la de novo com o Plotly Express. O orçamento em bytes
+    (TOURISM_FIGURE_CACHE_MB, padrão 64 MB) é medido pelo tamanho do JSON.
+    """
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(os.environ.get('TOURISM_FIGURE_CACHE_MB', 64)) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self._cache = _CountingLRUCache(maxsize=max_bytes, getsizeof=len)
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(version, chart, **params):
+        """Chave da figura; listas de valores dos filtros entram ordenadas"""
+        def normalize(value):
+            if isinstance(value, dict):
+                return tuple((name, normalize(item)) for name, item in sorted(value.items()))
+            if isinstance(value, (list, set)):
+                return tuple(sorted(map(str, value)))
+            return value
+        return (version, chart, normalize(params))
+
+    def get_or_build(self, key, build):
+        """Figura em cache (reconstruída do JSON) ou montada por build() e guardada"""
+        # Importado só aqui: o cache de datasets não depende do Plotly
+        import plotly.io as pio
+
+        with self._lock:
+            serialized = self._cache.get(key)
+            if serialized is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if serialized is not None:
+            return pio.from_json(serialized)
+
+        fig = build()
+        if fig is not None:
+            serialized = fig.to_json()
+            with self._lock:
+                if len(serialized) <= self.max_bytes:
+                    self._cache[key] = serialized
+        return fig
+
+    def clear(self):
+        """Esvazia o cache (as estatísticas são mantidas)"""
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self):
+        """Estatísticas de uso: acertos, faltas, descartes e ocupação"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / requests if requests else 0.0,
+                'evictions': self._cache.evictions,
+                'entries': len(self._cache),
+                'bytes': self._cache.currsize,
+                'max_bytes': self.max_bytes
+            }
@@ -1,100 +1,123 @@
 import pandas as pd
-import streamlit as st
 import numpy as np
 from datetime import datetime
 
+from .regions import RegionRegistry
+from .reporting import Reporter
+
 class DataCollector:
-    def __init__(self):
-        self.nordeste_ufs = [
-            'Alagoas', 'Bahia', 'Ceará', 'Maranhão', 
-            'Paraíba', 'Pernambuco', 'Piauí', 
-            'Rio Grande do Norte', 'Sergipe'
-        ]
+    def __init__(self, reporter=None, regions=None):
+        # Mensagens e progresso vão para o reporter (log por padrão, Streamlit na aplicação)
+        self.reporter = reporter or Reporter()
+        
+        # UFs, países e continentes vêm da configuração de regiões (TOURISM_REGION)
+        self.regions = regions or RegionRegistry()
+        self.ufs = self.regions.region_ufs()
         
-        self.paises = ['Argentina', 'Estados Unidos', 'Portugal', 'França', 'Alemanha', 
-                      'Itália', 'Espanha', 'Reino Unido', 'Chile', 'Uruguai']
+        self.paises = self.regions.sample['paises']
         
-        self.continentes = ['América', 'Europa', 'Ásia', 'Oceania', 'África']
+        self.continentes = self.regions.continentes
         
-        self.vias_acesso = ['Aérea', 'Terrestre', 'Marítima']
+        self.vias_acesso = self.regions.sample['vias']
         
         self.meses = ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho',
                      'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro']
 
-    def generate_sample_data(self, years=5):
+    def generate_sample_data(self, years=5, records=None, seed=None, chunk_size=500_000):
         """Gera dados de exemplo realistas para demonstração"""
-        st.info("🎲 Gerando dados de exemplo realistas...")
-        
-        records_per_year = 5000
-        total_records = records_per_year * years
-        
-        data = []
-        
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        for i in range(total_records):
-            year = 2019 + (i // records_per_year) % years
-            uf = np.random.choice(self.nordeste_ufs)
-            pais = np.random.choice(self.paises)
-            continente = 'Europa' if pais in ['Portugal', 'França', 'Alemanha', 'Itália', 'Espanha', 'Reino Unido'] else \
-                        'América' if pais in ['Argentina', 'Estados Unidos', 'Chile', 'Uruguai'] else 'Ásia'
-            via = np.random.choice(self.vias_acesso)
-            mes = np.random.choice(self.meses)
-            
-            # Gerar chegadas realistas baseadas em padrões
-            base_arrivals = np.random.poisson(10)  # Base de chegadas
-            
-            # Ajustar por fatores sazonais
-            if mes in ['janeiro', 'julho', 'dezembro']:  # Alta temporada
-                base_arrivals *= 2
-            elif mes in ['fevereiro', 'março', 'abril']:  # Baixa temporada
-                base_arrivals *= 0.7
-            
-            # Ajustar por UF (Bahia e Pernambuco têm mais turistas)
-            if uf in ['Bahia', 'Pernambuco']:
-                base_arrivals *= 1.5
-            elif uf in ['Alagoas', 'Piauí']:
-                base_arrivals *= 0.8
-            
-            # Ajustar por ano (crescimento simulado)
-            year_factor = 1 + (year - 2019) * 0.1  # 10% de crescimento ao ano
-            base_arrivals *= year_factor
-            
-            chegadas = max(1, int(base_arrivals))
-            
-            data.append({
-                'Continente': continente,
-                'País': pais,
-                'UF': uf,
-                'Via de acesso': via,
-                'Ano': year,
-                'Mês': mes,
-                'Chegadas': chegadas
-            })
-            
-            if i % 500 == 0:
-                progress = (i + 1) / total_records
-                progress_bar.progress(progress)
-                status_text.text(f"Gerando dados... {i+1}/{total_records}")
-        
-        progress_bar.progress(1.0)
-        status_text.text("✅ Dados gerados com sucesso!")
+        self.reporter.info("🎲 Gerando dados de exemplo realistas...")
         
-        df = pd.DataFrame(data)
+        total_records = records if records is not None else 5000 * years
         
-        # Adicionar colunas de ordem para compatibilidade
-        df['Ordem continente'] = df['Continente'].map({'América': 1, 'Europa': 2, 'Ásia': 3, 'Oceania': 4, 'África': 5})
-        df['Ordem país'] = range(1, len(df) + 1)
-        df['Ordem UF'] = df['UF'].map({uf: i+1 for i, uf in enumerate(self.nordeste_ufs)})
-        df['Ordem via de acesso'] = df['Via de acesso'].map({'Aérea': 1, 'Terrestre': 2, 'Marítima': 3})
-        df['Ordem mês'] = df['Mês'].map({mes: i+1 for i, mes in enumerate(self.meses)})
+        progress = self.reporter.progress(total_records)
+        
+        chunks = []
+        generated = 0
+        for chunk in self.iter_sample_data(years, total_records, seed, chunk_size):
+            chunks.append(chunk)
+            generated += len(chunk)
+            progress.update(generated, f"Gerando dados... {generated}/{total_records}")
+        
+        progress.close("✅ Dados gerados com sucesso!")
+        
+        if len(chunks) == 1:
+            df = chunks[0]
+        else:
+            df = pd.concat(chunks, ignore_index=True)
         
         return {'SAMPLE_DATA': df}
 
+    def iter_sample_data(self, years=5, records=None, seed=None, chunk_size=500_000):
+        """Gera os dados de exemplo em blocos de tamanho fixo, com memória limitada"""
+        total_records = records if records is not None else 5000 * years
+        rng = np.random.default_rng(seed)
+        
+        for start in range(0, total_records, chunk_size):
+            stop = min(start + chunk_size, total_records)
+            yield self._build_sample_chunk(rng, start, stop, total_records, years)
+
+    def _build_sample_chunk(self, rng, start, stop, total_records, years):
+        """Gera as linhas [start, stop) do conjunto de exemplo de forma vetorizada"""
+        size = stop - start
+        
+        ufs = np.array(self.ufs, dtype=object)
+        paises = np.array(self.paises, dtype=object)
+        vias = np.array(self.vias_acesso, dtype=object)
+        meses = np.array(self.meses, dtype=object)
+        
+        # Mesma divisão sequencial dos registros em anos do laço original
+        row = np.arange(start, stop, dtype=np.int64)
+        year = 2019 + (row * years) // total_records
+        
+        uf_idx = rng.integers(0, len(ufs), size)
+        pais_idx = rng.integers(0, len(paises), size)
+        via_idx = rng.integers(0, len(vias), size)
+        mes_idx = rng.integers(0, len(meses), size)
+        
+        # Continente derivado do país pela tabela de países da configuração
+        continente_por_pais = self.regions.continent_of(self.paises)
+        
+        # Gerar chegadas realistas baseadas em padrões
+        base_arrivals = rng.poisson(10, size).astype(np.float64)  # Base de chegadas
+        
+        # Ajustar por fatores sazonais (alta: janeiro, julho, dezembro; baixa: fevereiro a abril)
+        season_factor = np.ones(len(meses))
+        season_factor[[self.meses.index(m) for m in ['janeiro', 'julho', 'dezembro']]] = 2
+        season_factor[[self.meses.index(m) for m in ['fevereiro', 'março', 'abril']]] = 0.7
+        base_arrivals *= season_factor[mes_idx]
+        
+        # Ajustar por UF (no Nordeste, Bahia e Pernambuco têm mais turistas)
+        uf_factor = self.regions.sample_uf_factors(self.ufs)
+        base_arrivals *= uf_factor[uf_idx]
+        
+        # Ajustar por ano (crescimento simulado de 10% ao ano)
+        base_arrivals *= 1 + (year - 2019) * 0.1
+        
+        chegadas = np.maximum(1, base_arrivals.astype(np.int64))
+        
+        df = pd.DataFrame({
+            'Continente': continente_por_pais[pais_idx],
+            'País': paises[pais_idx],
+            'UF': ufs[uf_idx],
+            'Via de acesso': vias[via_idx],
+            'Ano': year,
+            'Mês': meses[mes_idx],
+            'Chegadas': chegadas
+        })
+        
+        # Adicionar colunas de ordem para compatibilidade
+        continente_ordem = pd.Index(self.continentes).get_indexer(continente_por_pais) + 1
+        df['Ordem continente'] = continente_ordem[pais_idx]
+        df['Ordem país'] = row + 1
+        df['Ordem UF'] = uf_idx + 1
+        df['Ordem via de acesso'] = via_idx + 1
+        df['Ordem mês'] = mes_idx + 1
+        
+        return df
+
     def get_sample_data_quick(self):
         """Gera dados de exemplo mais rapidamente"""
-        st.info("⚡ Gerando dados de exemplo...")
+        self.reporter.info("⚡ Gerando dados de exemplo...")
         
         # Dados mais compactos mas ainda realistas
         np.random.seed(42)  # Para reproducibilidade
@@ -102,10 +125,14 @@ class DataCollector:
         records = 10000
         
         data = {
-            'Continente': np.random.choice(self.continentes, records, p=[0.4, 0.3, 0.15, 0.1, 0.05]),
+            'Continente': np.random.choice(
+                self.continentes, records, p=self.regions.sample_weights('pesos_continente', self.continentes)
+            ),
             'País': np.random.choice(self.paises, records),
-            'UF': np.random.choice(self.nordeste_ufs, records, p=[0.2, 0.18, 0.15, 0.1, 0.09, 0.12, 0.06, 0.05, 0.05]),
-            'Via de acesso': np.random.choice(self.vias_acesso, records, p=[0.7, 0.2, 0.1]),
+            'UF': np.random.choice(self.ufs, records, p=self.regions.sample_uf_weights(self.ufs)),
+            'Via de acesso': np.random.choice(
+                self.vias_acesso, records, p=self.regions.sample_weights('pesos_via', self.vias_acesso)
+            ),
             'Ano': np.random.choice([2019, 2020, 2021, 2022, 2023], records, p=[0.15, 0.1, 0.2, 0.25, 0.3]),
             'Mês': np.random.choice(self.meses, records),
         }
@@ -120,16 +147,20 @@ class DataCollector:
         high_season_mask = df['Mês'].isin(['janeiro', 'julho', 'dezembro'])
         df.loc[high_season_mask, 'Chegadas'] = (df.loc[high_season_mask, 'Chegadas'] * 2).astype(int)
         
-        popular_states_mask = df['UF'].isin(['Bahia', 'Pernambuco'])
-        df.loc[popular_states_mask, 'Chegadas'] = (df.loc[popular_states_mask, 'Chegadas'] * 1.5).astype(int)
+        # Só as UFs mais procuradas (fator acima de 1) recebem o aumento
+        uf_factor = pd.Series(self.regions.sample_uf_factors(self.ufs), index=self.ufs)
+        popular_states_mask = df['UF'].map(uf_factor) > 1
+        df.loc[popular_states_mask, 'Chegadas'] = (
+            df.loc[popular_states_mask, 'Chegadas'] * df.loc[popular_states_mask, 'UF'].map(uf_factor)
+        ).astype(int)
         
         # Adicionar colunas de ordem
         df['Ordem continente'] = df['Continente'].map({cont: i+1 for i, cont in enumerate(self.continentes)})
         df['Ordem país'] = range(1, len(df) + 1)
-        df['Ordem UF'] = df['UF'].map({uf: i+1 for i, uf in enumerate(self.nordeste_ufs)})
-        df['Ordem via de acesso'] = df['Via de acesso'].map({'Aérea': 1, 'Terrestre': 2, 'Marítima': 3})
+        df['Ordem UF'] = df['UF'].map({uf: i+1 for i, uf in enumerate(self.ufs)})
+        df['Ordem via de acesso'] = df['Via de acesso'].map({via: i+1 for i, via in enumerate(self.vias_acesso)})
         df['Ordem mês'] = df['Mês'].map({mes: i+1 for i, mes in enumerate(self.meses)})
         
-        st.success(f"✅ Gerados {len(df)} registros de exemplo")
+        self.reporter.success(f"✅ Gerados {len(df)} registros de exemplo")
         
         return {'SAMPLE_DATA': df}
\ No newline at end of file
@@ -0,0 +1,96 @@
+from .filters import FilterEngine
+
+
+class RollupCube:
+    """Agregados de Chegadas pré-calculados uma vez por versão do dataset
+
+    É o backend de consulta em memória (pandas); data/query.py traz o
+    ArrowBackend, com a mesma interface, para dados que não cabem na memória.
+    """
+
+    dimensions = ['Ano', 'Mês', 'UF', 'Continente', 'País', 'Via de acesso']
+
+    def __init__(self, data, version=None):
+        self.version = version
+        self.dimensions = [col for col in self.dimensions if col in data.columns]
+
+        # Único groupby sobre as linhas brutas; todo o resto parte daqui
+        self.base = (
+            data.groupby(self.dimensions, observed=True, dropna=False)['Chegadas']
+            .sum()
+            .reset_index()
+        )
+        self._rollups = {}
+        self._filters = None
+
+    @classmethod
+    def from_base(cls, base, dimensions, version=None):
+        """Cria um cubo a partir de uma tabela base já agregada"""
+        cube = cls.__new__(cls)
+        cube.version = version
+        cube.dimensions = list(dimensions)
+        cube.base = base
+        cube._rollups = {}
+        cube._filters = None
+        return cube
+
+    def rollup(self, keys):
+        """Soma de Chegadas agrupada pelas chaves, calculada sobre os grupos da base"""
+        keys = tuple(keys)
+        if keys not in self._rollups:
+            self._rollups[keys] = (
+                self.base.groupby(list(keys), observed=True)['Chegadas']
+                .sum()
+                .reset_index()
+            )
+        # Cópia rasa para que os gráficos possam ajustar colunas sem afetar o cache
+        return self._rollups[keys].copy()
+
+    def aggregate(self, query):
+        """Responde a uma Aggregation (chaves + filtros) a partir da tabela base"""
+        cube = self.select(query.filters) if query.filters else self
+        return cube.rollup(query.keys)
+
+    @property
+    def nbytes(self):
+        """Memória da base, dos rollups já calculados e dos índices de filtro, em bytes"""
+        total = int(self.base.memory_usage(deep=True).sum())
+        total += sum(int(rollup.memory_usage(deep=True).sum()) for rollup in list(self._rollups.values()))
+        if self._filters is not None:
+            total += self._filters.nbytes
+        return total
+
+    @property
+    def filters(self):
+        """Índices de filtro sobre os grupos da base, criados uma vez por cubo"""
+        if self._filters is None:
+            self._filters = FilterEngine(self.base)
+        return self._filters
+
+    def select(self, filters):
+        """Novo cubo restrito aos filtros (faixas ou listas de valores por dimensão)"""
+        return RollupCube.from_base(self.filters.select(filters), self.dimensions, self.version)
+
+    def filter(self, years=None):
+        """Retorna um novo cubo restrito ao intervalo de anos (inclusivo)"""
+        return self.select({'Ano': years})
+
+    @property
+    def empty(self):
+        return self.base.empty
+
+    def total(self):
+        """Total de chegadas do cubo"""
+        return self.base['Chegadas'].sum()
+
+    def year_range(self):
+        """Primeiro e último ano presentes no cubo"""
+        return int(self.base['Ano'].min()), int(self.base['Ano'].max())
+
+    def nunique(self, column):
+        """Quantidade de valores distintos de uma dimensão"""
+        return self.base[column].nunique()
+
+    def values(self, column):
+        """Valores distintos de uma dimensão, na ordem do índice de filtro"""
+        return self.filters.values(column)
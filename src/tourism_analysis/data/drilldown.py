@@ -0,0 +1,132 @@
+import pandas as pd
+
+from .cube import RollupCube
+from .query import Aggregation
+
+
+class DrillDown:
+    """Navegação hierárquica (Continente → País → UF → Mês) com agregados parciais por nível
+
+    O nível mais detalhado vem de uma única consulta ao backend (RollupCube ou
+    ArrowBackend, já agregados); cada nível acima é somado a partir do nível
+    filho. Descer ou subir na hierarquia só recorta um desses agregados, sem
+    voltar às linhas do dataset. `path` é a sequência de valores escolhidos a
+    partir do topo, ex.: ('Europa', 'Portugal').
+    """
+
+    hierarchy = ['Continente', 'País', 'UF', 'Mês']
+
+    def __init__(self, cube, hierarchy=None, filters=None):
+        self.cube = cube
+        self.hierarchy = [level for level in (hierarchy or self.hierarchy) if level in cube.dimensions]
+        self.filters = {column: condition for column, condition in (filters or {}).items() if condition is not None}
+        self._levels = None
+
+    @property
+    def levels(self):
+        """Série de Chegadas por nível, indexada pelos valores do topo até o nível"""
+        if self._levels is None:
+            self._levels = self._from_leaf(self._leaf(self.cube))
+        return self._levels
+
+    def _leaf(self, source):
+        """Nível mais detalhado, agregado pelo backend com os filtros cruzados"""
+        result = source.aggregate(Aggregation(self.hierarchy, self.filters))
+        return result.set_index(self.hierarchy)['Chegadas'].sort_index()
+
+    def _from_leaf(self, leaf):
+        # Cada nível é a soma do nível filho, que já é pequeno
+        levels = [leaf]
+        for depth in range(len(self.hierarchy) - 1, 0, -1):
+            levels.insert(0, levels[0].groupby(level=list(range(depth)), observed=True).sum())
+        return levels
+
+    def total(self, path=()):
+        """Total de chegadas do caminho (o caminho vazio é o total geral)"""
+        if not path:
+            return self.levels[0].sum()
+        series = self.levels[len(path) - 1]
+        return series.get(path[0] if len(path) == 1 else tuple(path), 0)
+
+    def children(self, path=()):
+        """Chegadas de cada valor do nível abaixo do caminho, com a participação no total do caminho"""
+        depth = len(path)
+        if depth >= len(self.hierarchy):
+            raise ValueError(f"O caminho já está no nível mais detalhado ({self.hierarchy[-1]})")
+
+        level = self.hierarchy[depth]
+        series = self.levels[depth]
+        if path:
+            try:
+                series = series.xs(tuple(path), level=list(range(depth)))
+            except KeyError:
+                series = series.iloc[:0].droplevel(list(range(depth)))
+
+        frame = series.rename('Chegadas').reset_index()
+        frame.columns = [level, 'Chegadas']
+        total = frame['Chegadas'].sum()
+        frame['Participação'] = frame['Chegadas'] / total if total else 0.0
+        return frame
+
+    def path_filters(self, path):
+        """Filtros equivalentes ao caminho, para cruzar com outros gráficos e consultas"""
+        return {level: [value] for level, value in zip(self.hierarchy, path)}
+
+    def cross_filters(self, path=()):
+        """Filtros do drill-down somados aos do caminho"""
+        return {**self.filters, **self.path_filters(path)}
+
+    def breakdown(self, keys, path=()):
+        """Agregação por outras chaves (ex.: Via de acesso) restrita ao caminho e aos filtros"""
+        return self.cube.aggregate(Aggregation(keys, self.cross_filters(path)))
+
+    def select(self, filters):
+        """Novo drill-down com filtros adicionais
+
+        Filtros só sobre níveis da hierarquia recortam o nível mais detalhado
+        já calculado; os demais (ex.: Ano, Via de acesso) exigem nova consulta.
+        """
+        filters = {column: condition for column, condition in filters.items() if condition is not None}
+        drill = DrillDown(self.cube, self.hierarchy, {**self.filters, **filters})
+        if self._levels is None or not all(
+            column in self.hierarchy and not isinstance(condition, tuple) for column, condition in filters.items()
+        ):
+            return drill
+
+        leaf = self.levels[-1]
+        mask = pd.Series(True, index=leaf.index)
+        for column, values in filters.items():
+            mask &= leaf.index.get_level_values(column).isin(list(values))
+        drill._levels = self._from_leaf(leaf[mask.to_numpy()])
+        return drill
+
+    def update(self, data, replaced=None):
+        """Incorpora novas linhas (ex.: um ano recém-processado) somando seus agregados a cada nível
+
+        `data` é um DataFrame ou um backend de consulta (cubo); só os grupos da
+        novidade são somados aos níveis existentes, sem recalcular o restante.
+        Ao reprocessar partições já incorporadas, passe em `replaced` as linhas
+        antigas dessas partições: seus agregados são subtraídos antes, e os
+        grupos que só existiam nelas e zeram saem dos níveis. Sem `replaced`, a
+        atualização só acrescenta; linhas repetidas seriam contadas duas vezes.
+        """
+        delta = self._from_leaf(self._leaf(self._source(data)))
+        removed = self._from_leaf(self._leaf(self._source(replaced))) if replaced is not None else None
+
+        levels = []
+        for depth, (current, change) in enumerate(zip(self.levels, delta)):
+            parts = [current, change]
+            if removed is not None:
+                parts.append(-removed[depth])
+            merged = pd.concat(parts).groupby(level=list(range(current.index.nlevels)), observed=True).sum()
+            if removed is not None:
+                # Grupos das partições substituídas que não voltaram na novidade
+                gone = removed[depth].index.difference(change.index)
+                merged = merged.drop(gone[merged.reindex(gone).fillna(0).to_numpy() == 0], errors='ignore')
+            levels.append(merged)
+        self._levels = levels
+        return self
+
+    @staticmethod
+    def _source(data):
+        return data if hasattr(data, 'rollup') else RollupCube(data)
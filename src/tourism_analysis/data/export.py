@@ -0,0 +1,148 @@
+import gzip
+import hashlib
+import io
+import itertools
+import os
+import tempfile
+from pathlib import Path
+
+
+class DatasetExporter:
+    """Exporta a visão filtrada em blocos para arquivos em disco, com cache por versão e filtro
+
+    Nenhum formato materializa o arquivo inteiro em memória: as linhas são
+    lidas do FilterEngine em blocos e gravadas à medida que são geradas.
+    Os arquivos ficam em TOURISM_EXPORT_DIR (padrão: diretório temporário) e
+    apenas os `max_files` mais recentes são mantidos.
+    """
+
+    formats = {
+        'csv': {'label': 'CSV', 'extension': '.csv', 'mime': 'text/csv'},
+        'csv.gz': {'label': 'CSV (gzip)', 'extension': '.csv.gz', 'mime': 'application/gzip'},
+        'csv.zst': {'label': 'CSV (zstd)', 'extension': '.csv.zst', 'mime': 'application/zstd'},
+        'parquet': {'label': 'Parquet', 'extension': '.parquet', 'mime': 'application/vnd.apache.parquet'}
+    }
+
+    def __init__(self, directory=None, chunk_size=100_000, max_files=16):
+        default_directory = Path(tempfile.gettempdir()) / 'tourism_exports'
+        self.directory = Path(directory or os.environ.get('TOURISM_EXPORT_DIR', default_directory))
+        self.chunk_size = chunk_size
+        self.max_files = max_files
+
+    def artifact_path(self, version, filters, fmt):
+        """Caminho do arquivo para a combinação de versão do dataset, filtros e formato"""
+        normalized = []
+        for column, condition in sorted(filters.items()):
+            if condition is None:
+                continue
+            if not isinstance(condition, tuple):
+                # A ordem de seleção dos valores não muda o resultado
+                condition = sorted(map(str, condition))
+            normalized.append((column, [str(value) for value in condition]))
+
+        key = hashlib.sha256(repr((version, normalized, fmt)).encode('utf-8')).hexdigest()[:24]
+        return self.directory / f"{key}{self.formats[fmt]['extension']}"
+
+    def cached_path(self, version, filters, fmt):
+        """Arquivo já gerado para a combinação, ou None"""
+        path = self.artifact_path(version, filters, fmt)
+        if not path.exists():
+            return None
+        # Atualiza o mtime para o descarte seguir a ordem de uso
+        path.touch()
+        return path
+
+    def iter_chunks(self, engine, filters):
+        """Linhas filtradas em blocos de `chunk_size`, sem copiar o conjunto inteiro"""
+        if hasattr(engine, 'iter_chunks'):
+            # Leitores fora da memória (ArrowRowReader) entregam os blocos direto do Parquet
+            yield from engine.iter_chunks(filters, self.chunk_size)
+            return
+
+        # As posições são calculadas uma vez; cada bloco copia só o seu trecho
+        positions = engine.positions(filters)
+        total_rows = len(engine.data) if positions is None else len(positions)
+        for start in range(0, total_rows, self.chunk_size):
+            rows = slice(start, start + self.chunk_size)
+            if positions is None:
+                yield engine.data.iloc[rows]
+            else:
+                yield engine.data.take(positions[rows])
+
+    def export(self, engine, filters, version, fmt):
+        """Gera (ou reaproveita) o arquivo da visão filtrada e retorna seu caminho"""
+        path = self.cached_path(version, filters, fmt)
+        if path is not None:
+            return path
+
+        path = self.artifact_path(version, filters, fmt)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.write(engine, filters, fmt, path)
+        self._evict()
+        return path
+
+    def write(self, engine, filters, fmt, path):
+        """Grava a visão filtrada em `path`, fora do cache (ex.: relatórios em lote)"""
+        path = Path(path)
+        chunks = self.iter_chunks(engine, filters)
+        first = next(chunks, None)
+        if first is None:
+            # Filtro sem linhas: o arquivo ainda leva o cabeçalho (ou o esquema, no Parquet)
+            first = engine.select(filters, slice(0, 0))
+        chunks = itertools.chain([first], chunks)
+
+        # Temporário exclusivo: exportações simultâneas da mesma chave não se misturam
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f'.{path.name}-', suffix='.tmp', delete=False) as tmp:
+            tmp_path = Path(tmp.name)
+        try:
+            if fmt == 'parquet':
+                self._write_parquet(chunks, tmp_path)
+            else:
+                self._write_csv(chunks, tmp_path, fmt)
+            # NamedTemporaryFile cria o arquivo com 0600; o resultado é um arquivo comum
+            os.chmod(tmp_path, 0o644)
+            # Renomeação atômica: um download concorrente nunca vê arquivo parcial
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return path
+
+    def _write_csv(self, chunks, path, fmt):
+        if fmt == 'csv.gz':
+            stream = gzip.open(path, 'wt', encoding='utf-8', newline='')
+        elif fmt == 'csv.zst':
+            import pyarrow as pa
+            stream = io.TextIOWrapper(pa.CompressedOutputStream(str(path), 'zstd'), encoding='utf-8', newline='')
+        else:
+            stream = open(path, 'w', encoding='utf-8', newline='')
+
+        with stream:
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(stream, header=(i == 0), index=False)
+
+    def _write_parquet(self, chunks, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema, compression='zstd')
+                writer.write_table(table.cast(writer.schema))
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def _evict(self):
+        """Remove os arquivos mais antigos além de `max_files`"""
+        files = sorted(
+            (f for f in self.directory.iterdir() if not f.name.endswith('.tmp')),
+            key=lambda f: f.stat().st_mtime,
+            reverse=True
+        )
+        for old in files[self.max_files:]:
+            old.unlink(missing_ok=True)
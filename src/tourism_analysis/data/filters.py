@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+
+class FilterEngine:
+    """Índices posicionais por dimensão para fatiar o dataset sem varrer a tabela
+
+    Cada índice guarda as posições das linhas ordenadas pelo código do valor,
+    de modo que as linhas de um valor (ou de uma faixa de valores) formam um
+    trecho contíguo. Os índices são construídos na primeira consulta a cada
+    dimensão e reaproveitados enquanto o dataset for o mesmo.
+    """
+
+    dimensions = ['Ano', 'UF', 'País', 'Via de acesso', 'Mês']
+
+    def __init__(self, data):
+        self.data = data
+        self._indexes = {}
+
+    def index(self, column):
+        """Índice da dimensão, construído sob demanda"""
+        if column not in self._indexes:
+            self._indexes[column] = self._build_index(self.data[column])
+        return self._indexes[column]
+
+    def build(self):
+        """Constrói de uma vez os índices de todas as dimensões presentes (ex.: antes de ir para o cache)"""
+        for column in self.dimensions:
+            if column in self.data.columns:
+                self.index(column)
+        return self
+
+    @property
+    def nbytes(self):
+        """Memória dos índices já construídos, em bytes (sem a tabela indexada)"""
+        return sum(
+            index[name].nbytes for index in list(self._indexes.values()) for name in ('codes', 'order', 'offsets')
+        )
+
+    def _build_index(self, series):
+        """Codifica a coluna e ordena as posições das linhas por código"""
+        ordered = False
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            labels = series.cat.categories
+            ordered = series.cat.ordered
+        else:
+            # sort=True: códigos na ordem dos valores, o que permite consultas por faixa
+            codes, labels = pd.factorize(series, sort=True)
+
+        # Nulos (-1) vão para um código extra ao final, fora de qualquer filtro
+        codes = np.where(codes < 0, len(labels), codes).astype(np.int32)
+        counts = np.bincount(codes, minlength=len(labels) + 1)
+
+        return {
+            'codes': codes,
+            'labels': pd.Index(labels),
+            'ordered': ordered,
+            'order': np.argsort(codes, kind='stable'),
+            'offsets': np.concatenate([[0], np.cumsum(counts)])
+        }
+
+    def _wanted_codes(self, index, condition):
+        """Códigos atendidos por uma faixa (tupla min, max) ou conjunto de valores"""
+        labels = index['labels']
+        if isinstance(condition, tuple):
+            start, end = condition
+            if index['ordered']:
+                # Categorias ordenadas (Mês, UF) seguem a ordem da categoria, não a alfabética
+                return np.arange(labels.get_loc(start), labels.get_loc(end) + 1)
+            if labels.is_monotonic_increasing:
+                # Rótulos de factorize(sort=True): a faixa é um trecho contíguo de códigos
+                lo = labels.searchsorted(start, side='left')
+                hi = labels.searchsorted(end, side='right')
+                return np.arange(lo, hi)
+            # Categorias sem ordem definida: compara os poucos rótulos distintos
+            return np.flatnonzero((labels >= start) & (labels <= end))
+
+        codes = labels.get_indexer(list(condition))
+        return np.unique(codes[codes >= 0])
+
+    def positions(self, filters):
+        """Posições (ordenadas) das linhas que atendem a todos os filtros
+
+        `filters` mapeia coluna -> faixa (tupla min, max) ou lista de valores;
+        filtros None são ignorados. Retorna None quando não há filtro algum.
+        """
+        plans = []
+        for column, condition in filters.items():
+            if condition is None:
+                continue
+            index = self.index(column)
+            wanted = self._wanted_codes(index, condition)
+            offsets = index['offsets']
+            size = int((offsets[wanted + 1] - offsets[wanted]).sum())
+            plans.append((size, column, wanted))
+
+        if not plans:
+            return None
+
+        # Começa pela dimensão mais seletiva; as demais só testam os candidatos
+        plans.sort(key=lambda plan: plan[0])
+        _, column, wanted = plans[0]
+        index = self.index(column)
+        offsets = index['offsets']
+        slices = [index['order'][offsets[code]:offsets[code + 1]] for code in wanted]
+        positions = np.concatenate(slices) if slices else np.empty(0, dtype=np.intp)
+
+        for _, column, wanted in plans[1:]:
+            index = self.index(column)
+            member = np.zeros(len(index['labels']) + 1, dtype=bool)
+            member[wanted] = True
+            positions = positions[member[index['codes'][positions]]]
+
+        positions.sort()
+        return positions
+
+    def select(self, filters, rows=None):
+        """Linhas do dataset que atendem aos filtros, na ordem original
+
+        `rows` (um slice) recorta o resultado antes de copiar as linhas, para
+        paginar sem materializar todo o conjunto filtrado.
+        """
+        positions = self.positions(filters)
+        if positions is None:
+            return self.data if rows is None else self.data.iloc[rows]
+        if rows is not None:
+            positions = positions[rows]
+        return self.data.take(positions)
+
+    def count(self, filters):
+        """Quantidade de linhas que atendem aos filtros"""
+        positions = self.positions(filters)
+        return len(self.data) if positions is None else len(positions)
+
+    def values(self, column):
+        """Valores distintos da dimensão, na ordem do índice"""
+        index = self.index(column)
+        counts = np.diff(index['offsets'])[:len(index['labels'])]
+        return list(index['labels'][counts > 0])
@@ -0,0 +1,140 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .reporting import Reporter
+
+
+class Job:
+    """Tarefa em segundo plano; progresso e mensagens podem ser lidos de qualquer sessão"""
+
+    def __init__(self, key, label=None):
+        self.key = key
+        self.label = label or str(key)
+        self.fraction = 0.0
+        self.text = None
+        self.messages = []
+        self.started = None
+        self.finished = None
+        self.future = None
+
+    @property
+    def done(self):
+        return self.future.done()
+
+    @property
+    def status(self):
+        """'na fila', 'executando', 'concluido' ou 'erro'"""
+        if not self.done:
+            return 'executando' if self.started else 'na fila'
+        return 'erro' if self.future.exception() else 'concluido'
+
+    @property
+    def error(self):
+        return self.future.exception() if self.done else None
+
+    def result(self, timeout=None):
+        """Resultado da tarefa (espera até `timeout` segundos; relança o erro, se houver)"""
+        return self.future.result(timeout)
+
+
+class JobReporter(Reporter):
+    """Reporter que guarda mensagens e progresso no Job, além de enviá-los ao log"""
+
+    def __init__(self, job, logger=None):
+        super().__init__(logger)
+        self.job = job
+
+    def info(self, message):
+        super().info(message)
+        self.job.messages.append(('info', message))
+
+    def success(self, message):
+        super().success(message)
+        self.job.messages.append(('success', message))
+
+    def warning(self, message):
+        super().warning(message)
+        self.job.messages.append(('warning', message))
+
+    def error(self, message):
+        super().error(message)
+        self.job.messages.append(('error', message))
+
+    def progress(self, total):
+        return JobProgress(self.job, total)
+
+
+class JobProgress:
+    """Progresso gravado no Job, consultado pela página a cada atualização"""
+
+    def __init__(self, job, total):
+        self.job = job
+        self.total = max(total, 1)
+
+    def update(self, done, text=None):
+        self.job.fraction = min(done / self.total, 1.0)
+        if text:
+            self.job.text = text
+
+    def close(self, text=None):
+        self.job.fraction = 1.0
+        if text:
+            self.job.text = text
+
+
+class JobRunner:
+    """Fila de preparação de datasets executada em threads, sem bloquear as sessões
+
+    Um pedido com a mesma chave de um job ainda em andamento recebe esse mesmo
+    job, venha da mesma sessão (clique duplo) ou de outra. Threads em vez de
+    processos: o resultado vai para o cache do processo sem serialização, e
+    pandas/pyarrow liberam o GIL nas etapas pesadas. Com um único worker
+    (padrão) as gravações no store nunca se sobrepõem. Jobs concluídos ficam
+    disponíveis por `retention` segundos para as sessões buscarem o resultado.
+    """
+
+    def __init__(self, max_workers=1, retention=600):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tourism-job')
+        self.retention = retention
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, task, label=None):
+        """Agenda task(reporter) e retorna o Job; repete o job em andamento com a mesma chave"""
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(key)
+            if job is not None and not job.done:
+                return job
+            job = Job(key, label)
+            job.future = self.executor.submit(self._run, job, task)
+            self._jobs[key] = job
+            return job
+
+    def _run(self, job, task):
+        job.started = time.time()
+        try:
+            return task(JobReporter(job))
+        finally:
+            job.finished = time.time()
+
+    def _prune(self):
+        # Jobs concluídos seguram o resultado; só os recentes ficam para as sessões
+        limit = time.time() - self.retention
+        for key, job in list(self._jobs.items()):
+            if job.done and job.finished is not None and job.finished < limit:
+                del self._jobs[key]
+
+    def get(self, key):
+        """Job da chave (em andamento ou concluído recentemente) ou None"""
+        with self._lock:
+            return self._jobs.get(key)
+
+    def active(self):
+        """Jobs na fila ou em execução"""
+        with self._lock:
+            return [job for job in self._jobs.values() if not job.done]
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
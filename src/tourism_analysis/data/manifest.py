@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# Incrementar quando o esquema do store mudar, para invalidar o que já está gravado
+SCHEMA_VERSION = 2
+
+
+def schema_version(region):
+    """Versão do esquema do store para a região; o store só guarda as UFs dela"""
+    return f"{SCHEMA_VERSION}-{region}"
+
+
+class SourceManifest:
+    """Registro das fontes já consolidadas no store (hash, mtime, linhas e versão do esquema)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.sources = {}
+        if self.path.exists():
+            self.sources = json.loads(self.path.read_text(encoding='utf-8')).get('sources', {})
+
+    def save(self):
+        """Grava o manifesto em disco"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        content = json.dumps({'sources': self.sources}, ensure_ascii=False, indent=2)
+        self.path.write_text(content, encoding='utf-8')
+
+    def file_hash(self, path):
+        """SHA-256 do conteúdo do arquivo, lido em blocos"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def params_hash(self, params):
+        """SHA-256 dos parâmetros de uma fonte gerada (dados de exemplo)"""
+        content = json.dumps(params, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def is_current(self, name, path, schema_version):
+        """Indica se o arquivo já foi processado e não mudou desde então"""
+        entry = self.sources.get(name)
+        if entry is None or entry['schema_version'] != schema_version:
+            return False
+        if entry['path'] != str(path):
+            return False
+
+        stat = os.stat(path)
+        if entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+            return True
+        # mtime/tamanho mudaram: só o hash confirma se o conteúdo mudou
+        return entry['sha256'] == self.file_hash(path)
+
+    def changed(self, files, schema_version):
+        """Fontes novas ou modificadas entre `files` ({nome: caminho})"""
+        return {
+            name: path for name, path in files.items()
+            if not self.is_current(name, path, schema_version)
+        }
+
+    def removed(self, files):
+        """Fontes registradas que não fazem mais parte de `files`"""
+        return [name for name in self.sources if name not in files]
+
+    def record_file(self, name, path, year, rows, schema_version):
+        """Registra um arquivo processado"""
+        stat = os.stat(path)
+        self.sources[name] = {
+            'path': str(path),
+            'sha256': self.file_hash(path),
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'year': year,
+            'rows': rows,
+            'schema_version': schema_version
+        }
+
+    def record_generated(self, name, params, rows, schema_version):
+        """Registra uma fonte gerada, identificada pelo hash dos parâmetros"""
+        self.sources[name] = {
+            'path': None,
+            'sha256': self.params_hash(params),
+            'mtime': None,
+            'size': None,
+            'year': None,
+            'rows': rows,
+            'schema_version': schema_version
+        }
+
+    def matches_generated(self, name, params, schema_version):
+        """Indica se a fonte gerada com estes parâmetros já está no store"""
+        entry = self.sources.get(name)
+        return (
+            entry is not None
+            and entry['schema_version'] == schema_version
+            and entry['sha256'] == self.params_hash(params)
+        )
+
+    def matches_schema(self, schema_version):
+        """Indica se há fontes registradas e todas foram gravadas com esta versão do esquema"""
+        return bool(self.sources) and all(
+            entry['schema_version'] == schema_version for entry in self.sources.values()
+        )
+
+    def forget(self, name):
+        """Remove uma fonte do registro"""
+        self.sources.pop(name, None)
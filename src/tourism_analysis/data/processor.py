@@ -1,13 +1,57 @@
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
 import pandas as pd
-import streamlit as st
+
+from .manifest import SourceManifest, schema_version
+from .regions import RegionRegistry
+from .reporting import Reporter
+
+def load_file_worker(regions, path, year, chunksize, sep, encoding):
+    """Carrega um arquivo anual em um processo do pool
+    
+    Função de módulo com um processador novo: o processador de quem chama pode
+    ter métodos instrumentados pelo Profiler, que não são serializáveis.
+    """
+    return DataProcessor(regions=regions).load_file(path, year, chunksize, sep, encoding)
 
 class DataProcessor:
-    def __init__(self):
-        self.nordeste_ufs = [
-            'Alagoas', 'Bahia', 'Ceará', 'Maranhão', 
-            'Paraíba', 'Pernambuco', 'Piauí', 
-            'Rio Grande do Norte', 'Sergipe'
-        ]
+    def __init__(self, reporter=None, regions=None):
+        # Avisos e erros vão para o reporter (log por padrão, Streamlit na aplicação)
+        self.reporter = reporter or Reporter()
+        
+        # UFs da região ativa, vindas da configuração de regiões (TOURISM_REGION)
+        self.regions = regions or RegionRegistry()
+        self.ufs = self.regions.region_ufs()
+        
+        self.meses = ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho',
+                      'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro']
+        
+        # Esquema compacto do DataFrame consolidado
+        # Categorias ordenadas para Mês e UF; None = categorias inferidas dos dados
+        self.category_schema = {
+            'Continente': None,
+            'País': None,
+            'UF': self.ufs,
+            'Via de acesso': None,
+            'Mês': self.meses
+        }
+        self.integer_schema = {
+            'Ano': 'int16',
+            'Chegadas': 'int32',
+            'Ordem continente': 'int8',
+            'Ordem país': 'int32',
+            'Ordem UF': 'int8',
+            'Ordem via de acesso': 'int8',
+            'Ordem mês': 'int8'
+        }
+        self.required_columns = ['UF', 'Ano', 'Chegadas']
+        # Versão do esquema gravada no manifesto; inclui a região ativa
+        self.schema_version = schema_version(self.regions.region)
+        self.last_memory_report = None
     
     def unify_column_names(self, df, year):
         """Padroniza nomes de colunas entre diferentes anos"""
@@ -29,18 +73,210 @@ class DataProcessor:
             
         return df
     
-    def filter_northeast_data(self, df):
-        """Filtra dados apenas para estados do Nordeste"""
+    def filter_region_data(self, df):
+        """Filtra dados apenas para as UFs da região ativa (por nome ou sigla)"""
         if 'UF' not in df.columns:
-            st.warning("Dataset não contém coluna UF")
+            self.reporter.warning("Dataset não contém coluna UF")
             return df
-            
-        nordeste_df = df[df['UF'].isin(self.nordeste_ufs)].copy()
-        return nordeste_df
+        
+        # Comparação sobre códigos inteiros; só os valores distintos são lidos como texto
+        codes = self.regions.uf_codes(df['UF'])
+        mask = self.regions.region_member()[codes]
+        region_df = df[mask].copy()
+        
+        # Siglas viram nomes, para que o esquema de categorias reconheça as UFs
+        if not region_df.empty and not region_df['UF'].isin(self.ufs).all():
+            region_df['UF'] = self.regions.uf_names(codes[mask])
+        return region_df
+    
+    def filter_northeast_data(self, df):
+        """Nome antigo de filter_region_data, mantido para quem ainda o chama"""
+        warnings.warn(
+            "filter_northeast_data está obsoleto; use filter_region_data",
+            DeprecationWarning, stacklevel=2
+        )
+        return self.filter_region_data(df)
+    
+    def validate_schema(self, df):
+        """Verifica o DataFrame contra o esquema e retorna a lista de problemas encontrados"""
+        problems = []
+        
+        for col in self.required_columns:
+            if col not in df.columns:
+                problems.append(f"Coluna obrigatória ausente: {col}")
+        
+        for col, dtype in self.integer_schema.items():
+            if col not in df.columns:
+                continue
+            if not pd.api.types.is_integer_dtype(df[col]):
+                problems.append(f"Coluna {col} deveria ser inteira, encontrado {df[col].dtype}")
+            elif len(df) and not self._fits(df[col], dtype):
+                problems.append(f"Coluna {col} excede a faixa de {dtype}")
+        
+        for col, categories in self.category_schema.items():
+            if col not in df.columns or categories is None:
+                continue
+            unknown = set(df[col].dropna().unique()) - set(categories)
+            if unknown:
+                problems.append(f"Valores desconhecidos em {col}: {sorted(map(str, unknown))[:5]}")
+        
+        return problems
+    
+    def apply_schema(self, df):
+        """Converte as colunas para categorias ordenadas e inteiros de largura reduzida"""
+        for col, categories in self.category_schema.items():
+            if col not in df.columns:
+                continue
+            if categories is None:
+                if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                    df[col] = df[col].astype('category')
+            elif set(df[col].dropna().unique()) <= set(categories):
+                df[col] = pd.Categorical(df[col], categories=categories, ordered=True)
+            elif not isinstance(df[col].dtype, pd.CategoricalDtype):
+                # Valores fora do esquema: mantém categoria sem ordem para não perder dados
+                df[col] = df[col].astype('category')
+        
+        for col, dtype in self.integer_schema.items():
+            if col in df.columns and pd.api.types.is_integer_dtype(df[col]) and self._fits(df[col], dtype):
+                df[col] = df[col].astype(dtype)
+        
+        return df
+    
+    def _fits(self, series, dtype):
+        """Indica se todos os valores da série cabem no tipo inteiro informado"""
+        if series.empty:
+            return True
+        info = np.iinfo(dtype)
+        return info.min <= series.min() and series.max() <= info.max
+    
+    def memory_usage(self, df, sample_size=10_000):
+        """Memória ocupada pelo DataFrame, em bytes (strings estimadas por amostragem)"""
+        total = int(df.memory_usage(deep=False).sum())
+        
+        # Medir cada string é caro em milhões de linhas; extrapola a partir de uma amostra
+        for col in df.select_dtypes(include='object').columns:
+            sample = df[col] if len(df) <= sample_size else df[col].sample(sample_size, random_state=0)
+            extra = sample.memory_usage(index=False, deep=True) - sample.memory_usage(index=False)
+            total += int(extra * len(df) / max(len(sample), 1))
+        
+        return total
+    
+    def dataset_year(self, name):
+        """Extrai o ano do nome do dataset (ex.: CHEGADAS_2019)"""
+        try:
+            return int(name.split('_')[1])
+        except (ValueError, IndexError):
+            # Se não conseguir extrair o ano, usar um padrão
+            self.reporter.warning(f"Não foi possível extrair ano do dataset {name}, usando 2023 como padrão")
+            return 2023
+    
+    def iter_file_chunks(self, path, year, chunksize=200_000, sep=';', encoding='latin-1'):
+        """Lê um arquivo anual em blocos, padronizando e filtrando cada bloco"""
+        for chunk in pd.read_csv(path, sep=sep, encoding=encoding, chunksize=chunksize):
+            chunk = self.unify_column_names(chunk, year)
+            chunk = self.filter_region_data(chunk)
+            if not chunk.empty:
+                yield self.apply_schema(chunk)
+    
+    def iter_files_chunks(self, files, chunksize=200_000, sep=';', encoding='latin-1', rows=None):
+        """Blocos de vários arquivos anuais, em ordem crescente de ano
+        
+        Se `rows` for um dicionário, acumula nele as linhas lidas de cada arquivo.
+        """
+        for year, name, path in sorted((self.dataset_year(name), name, path) for name, path in files.items()):
+            if rows is not None:
+                rows.setdefault(name, 0)
+            for chunk in self.iter_file_chunks(path, year, chunksize, sep, encoding):
+                if rows is not None:
+                    rows[name] += len(chunk)
+                yield chunk
+    
+    def consolidate_files(self, files, store, chunksize=200_000, sep=';', encoding='latin-1'):
+        """Consolida arquivos CSV anuais em streaming, gravando bloco a bloco no store
+        
+        A memória de pico fica limitada ao tamanho do bloco, não ao total de dados.
+        `files` mapeia o nome do dataset (ex.: CHEGADAS_2019) para o caminho do CSV.
+        """
+        rows = store.write_frames(self.iter_files_chunks(files, chunksize, sep, encoding))
+        if rows == 0:
+            self.reporter.error("Nenhum dado foi consolidado. Verifique a estrutura dos dados.")
+        return rows
+    
+    def load_file(self, path, year, chunksize=200_000, sep=';', encoding='latin-1'):
+        """Lê, padroniza e filtra um arquivo anual completo"""
+        chunks = list(self.iter_file_chunks(path, year, chunksize, sep, encoding))
+        if not chunks:
+            return pd.DataFrame()
+        return self.apply_schema(pd.concat(chunks, ignore_index=True))
+    
+    def load_files(self, files, workers=1, chunksize=200_000, sep=';', encoding='latin-1'):
+        """Processa cada arquivo anual em um pool de processos
+        
+        Com `workers=1` o processamento é serial; `workers=None` usa todos os núcleos.
+        Retorna tuplas (nome, ano, DataFrame) sempre em ordem crescente de ano,
+        independente da ordem de conclusão.
+        """
+        jobs = sorted((self.dataset_year(name), name, path) for name, path in files.items())
+        years = [year for year, _, _ in jobs]
+        paths = [path for _, _, path in jobs]
+        
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(jobs))
+        
+        options = ([chunksize] * len(jobs), [sep] * len(jobs), [encoding] * len(jobs))
+        if workers <= 1:
+            frames = list(map(self.load_file, paths, years, *options))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                frames = list(pool.map(load_file_worker, repeat(self.regions), paths, years, *options))
+        
+        return [(name, year, df) for (year, name, _), df in zip(jobs, frames)]
+    
+    def refresh_store(self, files, store, workers=1, chunksize=200_000, sep=';', encoding='latin-1'):
+        """Atualiza o store reprocessando apenas os anos cujos arquivos mudaram
+        
+        Compara `files` ({nome: caminho}) com o manifesto do store e regrava somente
+        as partições dos anos com arquivos novos, modificados ou removidos. Com
+        `workers=1` os arquivos são gravados bloco a bloco (memória limitada ao
+        bloco); com mais workers cada ano é lido inteiro em um processo do pool.
+        Retorna a lista de anos reprocessados.
+        """
+        manifest = SourceManifest(store.manifest_path)
+        changed = manifest.changed(files, self.schema_version)
+        removed = manifest.removed(files)
+        
+        years = {self.dataset_year(name) for name in changed}
+        years |= {manifest.sources[name]['year'] for name in removed}
+        if not years:
+            return []
+        
+        # Um ano é regravado inteiro: inclui os arquivos inalterados do mesmo ano
+        affected = {name: path for name, path in files.items() if self.dataset_year(name) in years}
+        
+        store.drop_years(years)
+        for name in removed:
+            manifest.forget(name)
+        
+        if workers == 1:
+            # Serial: os blocos vão direto para o store, sem juntar o ano inteiro
+            rows = {}
+            store.write_frames(self.iter_files_chunks(affected, chunksize, sep, encoding, rows), append=True)
+        else:
+            loaded = self.load_files(affected, workers, chunksize, sep, encoding)
+            store.write_frames((df for _, _, df in loaded if not df.empty), append=True)
+            rows = {name: len(df) for name, _, df in loaded}
+        
+        for name, path in affected.items():
+            manifest.record_file(name, path, self.dataset_year(name), rows[name], self.schema_version)
+        manifest.save()
+        
+        return sorted(years)
     
     def consolidate_data(self, datasets):
         """Consolida todos os datasets em um único DataFrame"""
         consolidated_data = []
+        memory_before = 0
         
         for name, df in datasets.items():
             # Para dados de exemplo, usar anos do próprio DataFrame
@@ -53,21 +289,26 @@ class DataProcessor:
                     df_processed = self.unify_column_names(df, 2023)
             else:
                 # Para dados reais, tentar extrair o ano do nome
-                try:
-                    year = int(name.split('_')[1])
-                    df_processed = self.unify_column_names(df, year)
-                except (ValueError, IndexError):
-                    # Se não conseguir extrair o ano, usar um padrão
-                    st.warning(f"Não foi possível extrair ano do dataset {name}, usando 2023 como padrão")
-                    df_processed = self.unify_column_names(df, 2023)
+                df_processed = self.unify_column_names(df, self.dataset_year(name))
+            
+            df_region = self.filter_region_data(df_processed)
             
-            df_nordeste = self.filter_northeast_data(df_processed)
+            for problem in self.validate_schema(df_region):
+                self.reporter.warning(f"{name}: {problem}")
             
-            if not df_nordeste.empty:
-                consolidated_data.append(df_nordeste)
+            if not df_region.empty:
+                memory_before += self.memory_usage(df_region)
+                consolidated_data.append(self.apply_schema(df_region))
         
         if consolidated_data:
-            return pd.concat(consolidated_data, ignore_index=True)
+            result = pd.concat(consolidated_data, ignore_index=True)
+            # Categorias divergentes entre datasets voltam a object no concat
+            result = self.apply_schema(result)
+            self.last_memory_report = {
+                'antes': memory_before,
+                'depois': self.memory_usage(result)
+            }
+            return result
         else:
-            st.error("Nenhum dado foi consolidado. Verifique a estrutura dos dados.")
+            self.reporter.error("Nenhum dado foi consolidado. Verifique a estrutura dos dados.")
             return pd.DataFrame()
\ No newline at end of file
@@ -0,0 +1,243 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from .cube import RollupCube
+from .regions import RegionRegistry
+
+MESES = ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho',
+         'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro']
+
+
+class Aggregation:
+    """Consulta declarativa: soma da medida agrupada por chaves, com filtros
+
+    `filters` segue o formato do FilterEngine: coluna -> faixa (tupla min, max)
+    ou lista de valores; filtros None são ignorados. Os backends (RollupCube em
+    memória, ArrowBackend sobre Parquet) respondem à mesma consulta.
+    """
+
+    def __init__(self, keys, filters=None, measure='Chegadas'):
+        self.keys = tuple(keys)
+        self.filters = {column: condition for column, condition in (filters or {}).items() if condition is not None}
+        self.measure = measure
+
+    def key(self):
+        """Identificação da consulta para memoização"""
+        filters = tuple(
+            (column, condition if isinstance(condition, tuple) else tuple(sorted(map(str, condition))))
+            for column, condition in sorted(self.filters.items())
+        )
+        return (self.keys, filters, self.measure)
+
+
+def range_orders(regions=None):
+    """Ordem das dimensões ordenadas: Mês pelo calendário, UF pela ordem da região"""
+    return {'Mês': MESES, 'UF': (regions or RegionRegistry()).region_ufs()}
+
+
+def filter_expression(filters, orders=None):
+    """Expressão do pyarrow para os filtros; colunas de partição descartam arquivos inteiros
+
+    Faixas sobre dimensões de `orders` (ver range_orders) seguem a posição na
+    ordem da dimensão, como no FilterEngine, e não a comparação de texto.
+    """
+    orders = orders or {}
+    expression = None
+    for column, condition in filters.items():
+        if condition is None:
+            continue
+        if isinstance(condition, tuple):
+            start, end = condition
+            if column in orders:
+                levels = list(orders[column])
+                wanted = levels[levels.index(start):levels.index(end) + 1]
+                condition_expression = ds.field(column).isin(wanted)
+            else:
+                condition_expression = (ds.field(column) >= start) & (ds.field(column) <= end)
+        else:
+            condition_expression = ds.field(column).isin(list(condition))
+        expression = condition_expression if expression is None else expression & condition_expression
+    return expression
+
+
+class ArrowBackend:
+    """Agregações executadas sobre o dataset Parquet do store, sem carregá-lo no pandas
+
+    Cada consulta lê apenas as colunas de agrupamento e a medida, em lotes: cada
+    lote é agregado e só os grupos parciais ficam em memória, de modo que o
+    volume de dados pode exceder a memória do processo. Oferece a mesma
+    interface do RollupCube (rollup, select, total...), então ChartBuilder,
+    métricas e previsões funcionam com qualquer um dos dois.
+    """
+
+    def __init__(self, store, filters=None, version=None, batch_size=1 << 20, orders=None):
+        self.store = store
+        self.version = version
+        self.batch_size = batch_size
+        self.where = {column: condition for column, condition in (filters or {}).items() if condition is not None}
+        self.orders = orders or range_orders()
+        self.meses = MESES
+        self._dataset = None
+        self._results = {}
+
+    @property
+    def dataset(self):
+        if self._dataset is None:
+            self._dataset = self.store.dataset()
+        return self._dataset
+
+    @property
+    def dimensions(self):
+        return [col for col in RollupCube.dimensions if col in self.dataset.schema.names]
+
+    def _scanner(self, columns, filters=None):
+        expression = filter_expression({**self.where, **(filters or {})}, self.orders)
+        return self.dataset.scanner(columns=columns, filter=expression, batch_size=self.batch_size)
+
+    def aggregate(self, query):
+        """Resultado da consulta como DataFrame (chaves + medida), ordenado pelas chaves"""
+        cache_key = query.key()
+        if cache_key not in self._results:
+            self._results[cache_key] = self._run(query)
+        return self._results[cache_key].copy()
+
+    def _run(self, query):
+        keys = list(query.keys)
+        scanner = self._scanner(keys + [query.measure], query.filters)
+
+        if not keys:
+            total = sum(pc.sum(batch.column(query.measure)).as_py() or 0 for batch in scanner.to_batches())
+            return pa.table({query.measure: [total]}).to_pandas()
+
+        # Agrega lote a lote; a soma final junta os grupos parciais
+        partials = [
+            pa.Table.from_batches([batch]).group_by(keys).aggregate([(query.measure, 'sum')])
+            for batch in scanner.to_batches() if batch.num_rows
+        ]
+        if partials:
+            table = pa.concat_tables(partials).group_by(keys).aggregate([(f'{query.measure}_sum', 'sum')])
+            table = table.rename_columns(keys + [query.measure])
+        else:
+            schema = self.dataset.schema
+            table = pa.table({
+                column: pa.array([], type=schema.field(column).type) for column in keys + [query.measure]
+            })
+
+        result = table.to_pandas()
+        # Dicionários de arquivos diferentes não garantem a mesma ordem de categorias
+        for column in keys:
+            if isinstance(result[column].dtype, pd.CategoricalDtype):
+                result[column] = result[column].astype(str)
+        if 'Mês' in keys:
+            result['Mês'] = pd.Categorical(result['Mês'], categories=self.meses, ordered=True)
+        # Mesma ordem do groupby do pandas, com os meses em ordem de calendário
+        return result.sort_values(keys).reset_index(drop=True)
+
+    def rollup(self, keys):
+        """Soma de Chegadas agrupada pelas chaves"""
+        return self.aggregate(Aggregation(keys))
+
+    def select(self, filters):
+        """Novo backend restrito aos filtros (faixas ou listas de valores por dimensão)"""
+        return ArrowBackend(self.store, {**self.where, **filters}, self.version, self.batch_size, self.orders)
+
+    def filter(self, years=None):
+        """Retorna um novo backend restrito ao intervalo de anos (inclusivo)"""
+        return self.select({'Ano': years})
+
+    @property
+    def empty(self):
+        return self._scanner([]).count_rows() == 0
+
+    def total(self):
+        """Total de chegadas"""
+        return self.aggregate(Aggregation([]))['Chegadas'].iloc[0]
+
+    def year_range(self):
+        """Primeiro e último ano presentes"""
+        years = self.rollup(['Ano'])['Ano']
+        return int(years.min()), int(years.max())
+
+    def nunique(self, column):
+        """Quantidade de valores distintos de uma dimensão"""
+        return len(self.rollup([column]))
+
+    def values(self, column):
+        """Valores distintos da dimensão, ordenados"""
+        return list(self.rollup([column])[column])
+
+
+
+class ArrowRowReader:
+    """Linhas do store filtradas, paginadas e exportadas em lotes, no lugar do FilterEngine
+
+    Mesma interface usada pela aplicação e pelo DatasetExporter (count, select,
+    values), lendo do Parquet apenas os lotes necessários.
+    """
+
+    def __init__(self, store, batch_size=1 << 16, orders=None):
+        self.store = store
+        self.batch_size = batch_size
+        self.orders = orders or range_orders()
+        self._dataset = None
+
+    @property
+    def dataset(self):
+        if self._dataset is None:
+            self._dataset = self.store.dataset()
+        return self._dataset
+
+    def _batches(self, filters):
+        columns = self.store.column_order(self.dataset.schema)
+        scanner = self.dataset.scanner(
+            columns=columns, filter=filter_expression(filters, self.orders), batch_size=self.batch_size
+        )
+        return scanner.to_batches()
+
+    def count(self, filters):
+        """Quantidade de linhas que atendem aos filtros"""
+        return self.dataset.count_rows(filter=filter_expression(filters, self.orders))
+
+    def select(self, filters, rows=None):
+        """Linhas que atendem aos filtros; `rows` (um slice) recorta sem ler o restante"""
+        rows = rows or slice(None)
+        start, stop = rows.start or 0, rows.stop
+
+        selected = []
+        position = 0
+        for batch in self._batches(filters):
+            batch_start, position = position, position + batch.num_rows
+            if position <= start:
+                continue
+            if stop is not None and batch_start >= stop:
+                break
+            offset = max(start - batch_start, 0)
+            length = batch.num_rows - offset if stop is None else min(stop, position) - batch_start - offset
+            selected.append(batch.slice(offset, length))
+
+        if not selected:
+            return self.dataset.schema.empty_table().select(self.store.column_order(self.dataset.schema)).to_pandas()
+        return pa.Table.from_batches(selected).to_pandas()
+
+    def iter_chunks(self, filters, chunk_size):
+        """Linhas filtradas em DataFrames de até `chunk_size` linhas"""
+        pending = []
+        pending_rows = 0
+        for batch in self._batches(filters):
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            if pending_rows >= chunk_size:
+                yield pa.Table.from_batches(pending).to_pandas()
+                pending, pending_rows = [], 0
+        if pending:
+            yield pa.Table.from_batches(pending).to_pandas()
+
+    def values(self, column):
+        """Valores distintos da dimensão, ordenados (lidos lote a lote, sem carregar a coluna)"""
+        distinct = set()
+        for batch in self.dataset.scanner(columns=[column], batch_size=self.batch_size).to_batches():
+            distinct.update(pc.unique(batch.column(0)).to_pylist())
+        distinct.discard(None)
+        return sorted(distinct)
@@ -0,0 +1,116 @@
+import functools
+import os
+import tomllib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CONFIG = Path(__file__).with_name('regions.toml')
+DEFAULT_REGION = 'Nordeste'
+
+
+@functools.lru_cache(maxsize=None)
+def load_config(path):
+    """Lê o arquivo de regiões uma vez por processo"""
+    with open(path, 'rb') as f:
+        return tomllib.load(f)
+
+
+class RegionRegistry:
+    """Dimensões geográficas (UFs, regiões, países, continentes) carregadas da configuração
+
+    Cada dimensão é uma tabela com códigos inteiros na ordem do arquivo. As
+    colunas de texto são convertidas em códigos uma única vez (um factorize e
+    um mapeamento sobre os poucos valores distintos); filtros e junções
+    trabalham sobre esses códigos, sem comparar strings linha a linha.
+    """
+
+    def __init__(self, region=None, config_path=None):
+        self.config_path = Path(config_path or os.environ.get('TOURISM_REGIONS_FILE', DEFAULT_CONFIG))
+        config = load_config(self.config_path)
+        self.region = region or os.environ.get('TOURISM_REGION', DEFAULT_REGION)
+        if self.region not in config['regioes']:
+            raise ValueError(f"Região desconhecida: {self.region} (disponíveis: {', '.join(config['regioes'])})")
+
+        siglas = list(config['ufs'])
+        self.ufs = pd.DataFrame({
+            'code': np.arange(len(siglas), dtype=np.int8),
+            'Sigla': siglas,
+            'UF': [config['ufs'][sigla] for sigla in siglas]
+        })
+        self.regions = config['regioes']
+
+        self.continentes = list(config['continentes']['ordem'])
+        paises = list(config['paises'])
+        self.paises = pd.DataFrame({
+            'code': np.arange(len(paises), dtype=np.int16),
+            'País': paises,
+            'Continente': [config['paises'][pais] for pais in paises]
+        })
+        self.paises['Continente code'] = pd.Index(self.continentes).get_indexer(self.paises['Continente'])
+
+        self.sample = config.get('amostra', {})
+        # Nomes e siglas apontam para o mesmo código de UF
+        self._uf_lookup = pd.Index(list(self.ufs['UF']) + siglas)
+        self._uf_lookup_codes = np.concatenate([self.ufs['code'], self.ufs['code']])
+
+    def region_ufs(self, region=None):
+        """Nomes das UFs da região (padrão: a região ativa), na ordem dos códigos"""
+        members = set(self.regions[region or self.region])
+        return [uf for sigla, uf in zip(self.ufs['Sigla'], self.ufs['UF']) if sigla in members]
+
+    def uf_codes(self, values):
+        """Códigos das UFs (por nome ou sigla) de uma coluna; -1 para valores desconhecidos"""
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes, labels = values.cat.codes.to_numpy(), values.cat.categories
+        else:
+            codes, labels = pd.factorize(values)
+        # Só os rótulos distintos são comparados como texto; as linhas usam os códigos
+        positions = self._uf_lookup.get_indexer(labels)
+        label_codes = np.where(positions >= 0, self._uf_lookup_codes[positions], -1)
+        # Código -1 (nulo) cai na posição extra ao final, também -1
+        return np.append(label_codes, -1)[codes]
+
+    def region_member(self, region=None):
+        """Pertinência de cada código de UF à região, com uma posição extra (False) para -1"""
+        members = set(self.regions[region or self.region])
+        return np.append(self.ufs['Sigla'].isin(members).to_numpy(), False)
+
+    def region_mask(self, values, region=None):
+        """Máscara das linhas cujas UFs pertencem à região"""
+        return self.region_member(region)[self.uf_codes(values)]
+
+    def uf_names(self, codes):
+        """Nomes das UFs para os códigos (None para -1)"""
+        return np.append(self.ufs['UF'].to_numpy(dtype=object), None)[codes]
+
+    def continent_of(self, paises):
+        """Continente de cada país da lista, pela tabela de países (None se ausente)"""
+        positions = pd.Index(self.paises['País']).get_indexer(paises)
+        continents = np.append(self.paises['Continente'].to_numpy(dtype=object), None)
+        return continents[positions]
+
+    def sample_uf_weights(self, ufs):
+        """Pesos normalizados das UFs no sorteio dos dados rápidos"""
+        return self._normalize(self._by_sigla(ufs, self.sample.get('pesos_uf', {}), default=None))
+
+    def sample_weights(self, table, values):
+        """Pesos normalizados de `values` no sorteio dos dados rápidos, da tabela [amostra.<table>]"""
+        weights = self.sample.get(table, {})
+        return self._normalize([weights.get(value) for value in values])
+
+    def _normalize(self, weights):
+        # Valores sem peso configurado recebem o peso médio dos demais
+        known = [w for w in weights if w is not None]
+        mean = sum(known) / len(known) if known else 1.0
+        weights = np.array([mean if w is None else w for w in weights], dtype=np.float64)
+        return weights / weights.sum()
+
+    def sample_uf_factors(self, ufs):
+        """Multiplicador das chegadas de cada UF nos dados completos"""
+        return np.array(self._by_sigla(ufs, self.sample.get('fatores_uf', {}), default=1.0), dtype=np.float64)
+
+    def _by_sigla(self, ufs, values, default):
+        siglas = dict(zip(self.ufs['UF'], self.ufs['Sigla']))
+        return [values.get(siglas[uf], default) for uf in ufs]
@@ -0,0 +1,96 @@
+import logging
+
+
+class Reporter:
+    """Destino das mensagens e do progresso do pipeline, sem depender do Streamlit
+
+    Esta implementação padrão envia tudo para o logging, o que serve para
+    execuções em lote (CLI, cron) e testes. A aplicação usa StreamlitReporter.
+    """
+
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger('tourism_analysis')
+
+    def info(self, message):
+        self.logger.info(message)
+
+    def success(self, message):
+        self.logger.info(message)
+
+    def warning(self, message):
+        self.logger.warning(message)
+
+    def error(self, message):
+        self.logger.error(message)
+
+    def progress(self, total):
+        """Acompanhamento de uma tarefa com `total` unidades"""
+        return LogProgress(self.logger, total)
+
+
+class LogProgress:
+    """Progresso registrado no log a cada 10% concluídos"""
+
+    def __init__(self, logger, total, step=0.1):
+        self.logger = logger
+        self.total = max(total, 1)
+        self.step = step
+        self._next = step
+
+    def update(self, done, text=None):
+        fraction = done / self.total
+        if fraction >= self._next or done >= self.total:
+            self.logger.info(f"{text or 'Progresso'} ({fraction:.0%})")
+            while self._next <= fraction:
+                self._next += self.step
+
+    def close(self, text=None):
+        if text:
+            self.logger.info(text)
+
+
+class StreamlitReporter(Reporter):
+    """Mensagens e barras de progresso na página do Streamlit, além do log"""
+
+    def _st(self):
+        # Importado sob demanda: o pipeline não carrega o Streamlit fora da aplicação
+        import streamlit as st
+        return st
+
+    def info(self, message):
+        super().info(message)
+        self._st().info(message)
+
+    def success(self, message):
+        super().success(message)
+        self._st().success(message)
+
+    def warning(self, message):
+        super().warning(message)
+        self._st().warning(message)
+
+    def error(self, message):
+        super().error(message)
+        self._st().error(message)
+
+    def progress(self, total):
+        return StreamlitProgress(self._st(), total)
+
+
+class StreamlitProgress:
+    """Barra de progresso com texto de status logo abaixo"""
+
+    def __init__(self, st, total):
+        self.total = max(total, 1)
+        self.bar = st.progress(0)
+        self.status = st.empty()
+
+    def update(self, done, text=None):
+        self.bar.progress(min(done / self.total, 1.0))
+        if text:
+            self.status.text(text)
+
+    def close(self, text=None):
+        self.bar.progress(1.0)
+        if text:
+            self.status.text(text)
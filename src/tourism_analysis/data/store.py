@@ -0,0 +1,230 @@
+import itertools
+import os
+import shutil
+import threading
+import uuid
+import weakref
+from pathlib import Path
+
+# Snapshots em uso no processo (caminho -> DatasetStore); cada um é apagado do
+# disco quando nenhum objeto (cache, sessão, backend) o referencia mais
+_snapshots = weakref.WeakValueDictionary()
+_snapshots_lock = threading.RLock()
+
+
+def _remove_snapshot(path):
+    with _snapshots_lock:
+        # Outro objeto pode ter reaberto o mesmo snapshot antes da remoção
+        if path not in _snapshots:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+class DatasetStore:
+    """Armazena o DataFrame consolidado como um dataset Parquet particionado por Ano/UF
+
+    O pyarrow (que carrega o pandas) só é importado ao ler ou gravar: consultar
+    se o store existe não paga esse custo.
+    """
+
+    partition_columns = ['Ano', 'UF']
+
+    def __init__(self, root=None):
+        self.root = Path(root or os.environ.get('TOURISM_DATA_DIR', 'data_store'))
+        # Prefixo "_" faz o pyarrow ignorar o arquivo ao descobrir o dataset
+        self.manifest_path = self.root / '_manifest.json'
+
+    @property
+    def partitioning(self):
+        """Particionamento hive por Ano (inteiro) e UF (texto)"""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        return ds.partitioning(
+            pa.schema([('Ano', pa.int64()), ('UF', pa.string())]),
+            flavor='hive'
+        )
+
+    def exists(self):
+        """Indica se já existe um dataset gravado"""
+        return self.root.is_dir() and any(self.root.rglob('*.parquet'))
+
+    def write(self, df):
+        """Grava o DataFrame consolidado, substituindo o conteúdo anterior"""
+        return self.write_frames([df])
+
+    def write_frames(self, frames, append=False):
+        """Grava um fluxo de DataFrames em blocos, sem materializar o conjunto completo
+
+        Com `append=True` os arquivos são acrescentados às partições existentes.
+        """
+        import pyarrow.dataset as ds
+
+        frames = iter(frames)
+        first = next(frames, None)
+        if first is None:
+            return 0
+
+        first_table = self._to_table(first)
+        schema = first_table.schema
+        rows = 0
+
+        def batches():
+            nonlocal rows
+            # Todos os blocos seguem o esquema do primeiro
+            tables = (self._to_table(frame).cast(schema) for frame in frames)
+            for table in itertools.chain([first_table], tables):
+                rows += table.num_rows
+                yield from table.to_batches()
+
+        # Gravação completa vai para um diretório vizinho, trocado pelo atual só no
+        # final: uma falha no meio do fluxo deixa o store anterior intacto
+        target = self.root if append else self.root.with_name(f'.{self.root.name}-{uuid.uuid4().hex}.tmp')
+        try:
+            ds.write_dataset(
+                batches(),
+                target,
+                schema=schema,
+                format='parquet',
+                partitioning=self.partitioning,
+                basename_template=f'part-{uuid.uuid4().hex}-{{i}}.parquet',
+                existing_data_behavior='overwrite_or_ignore',
+                min_rows_per_group=1 << 16,
+                max_rows_per_group=1 << 20
+            )
+        except BaseException:
+            if not append:
+                shutil.rmtree(target, ignore_errors=True)
+            raise
+
+        if not append:
+            self._swap(target)
+        return rows
+
+    def _swap(self, target):
+        """Coloca o diretório recém-gravado no lugar do store e apaga o anterior"""
+        previous = None
+        if self.root.exists():
+            previous = self.root.with_name(f'.{self.root.name}-{uuid.uuid4().hex}.old')
+            os.replace(self.root, previous)
+        os.replace(target, self.root)
+        if previous is not None:
+            shutil.rmtree(previous, ignore_errors=True)
+
+    def _to_table(self, df):
+        """Converte o DataFrame para Arrow com os tipos esperados nas colunas de partição"""
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # Categorias inferidas por bloco teriam índices int8 em um bloco e int16 em
+        # outro; todo dicionário é gravado com índice int32, igual entre blocos e anos
+        for index, field in enumerate(table.schema):
+            if pa.types.is_dictionary(field.type):
+                wide = pa.dictionary(pa.int32(), pa.string(), field.type.ordered)
+                table = table.set_column(index, field.name, table[field.name].cast(wide))
+        table = table.set_column(
+            table.schema.get_field_index('Ano'), 'Ano', table['Ano'].cast(pa.int64())
+        )
+        table = table.set_column(
+            table.schema.get_field_index('UF'), 'UF', table['UF'].cast(pa.string())
+        )
+        return table
+
+    def dataset(self):
+        """Abre o dataset de forma preguiçosa (nenhum dado é lido aqui)"""
+        import pyarrow.dataset as ds
+
+        return ds.dataset(self.root, format='parquet', partitioning=self.partitioning)
+
+    def build_filter(self, years=None, ufs=None):
+        """Monta a expressão de filtro usada para descartar partições"""
+        import pyarrow.dataset as ds
+
+        expression = None
+
+        if years is not None:
+            start, end = years
+            expression = (ds.field('Ano') >= start) & (ds.field('Ano') <= end)
+
+        if ufs is not None:
+            uf_expression = ds.field('UF').isin(list(ufs))
+            expression = uf_expression if expression is None else expression & uf_expression
+
+        return expression
+
+    def read(self, columns=None, years=None, ufs=None):
+        """Lê apenas as colunas e partições (intervalo de anos, UFs) solicitadas"""
+        dataset = self.dataset()
+        table = dataset.to_table(columns=columns, filter=self.build_filter(years, ufs))
+        df = table.to_pandas()
+
+        # Colunas de partição voltam para a posição original da tabela
+        if columns is None:
+            df = df[self.column_order(table.schema)]
+
+        return df
+
+    def column_order(self, schema):
+        """Colunas na ordem do DataFrame gravado, segundo os metadados do pandas"""
+        metadata = schema.pandas_metadata
+        names = [c['name'] for c in metadata['columns'] if c['name'] in schema.names] if metadata else []
+        return names + [name for name in schema.names if name not in names]
+
+    def drop_years(self, years):
+        """Remove do disco as partições dos anos informados"""
+        for year in years:
+            path = self.root / f'Ano={year}'
+            if path.exists():
+                shutil.rmtree(path)
+
+    def snapshot(self, version):
+        """Store imutável com o conteúdo atual, em um diretório próprio da versão
+
+        Consultas fora da memória (ArrowBackend) leem o store sob demanda; apontá-las
+        para o snapshot impede que uma regravação troque os dados de uma versão já
+        em cache. Os arquivos são ligados por hard link quando possível, sem
+        duplicar dados. O diretório dura enquanto o DatasetStore retornado (ou o
+        backend que o usa) estiver referenciado; os que ninguém usa são apagados.
+        """
+        snapshots = self.root.with_name(f'{self.root.name}_versions')
+        signature = self.signature()
+        target = snapshots / f"{version}-{signature['parquet_files']}-{int(signature['mtime'] * 1e6)}"
+
+        with _snapshots_lock:
+            store = _snapshots.get(str(target))
+            if store is not None:
+                return store
+
+            if not target.exists():
+                staging = snapshots / f'.{target.name}-{uuid.uuid4().hex}.tmp'
+                for path in self.root.rglob('*.parquet'):
+                    destination = staging / path.relative_to(self.root)
+                    destination.parent.mkdir(parents=True, exist_ok=True)
+                    try:
+                        os.link(path, destination)
+                    except OSError:
+                        shutil.copy2(path, destination)
+                os.replace(staging, target)
+
+            store = DatasetStore(target)
+            _snapshots[str(target)] = store
+            weakref.finalize(store, _remove_snapshot, str(target))
+
+            # Snapshots sem referência (ex.: deixados por execuções anteriores)
+            for path in snapshots.iterdir():
+                if path.is_dir() and not path.name.startswith('.') and str(path) not in _snapshots:
+                    shutil.rmtree(path, ignore_errors=True)
+        return store
+
+    def signature(self):
+        """Identifica o conteúdo atual do store (quantidade e data dos arquivos)"""
+        files = list(self.root.rglob('*.parquet'))
+        return {
+            'parquet_files': len(files),
+            'mtime': max((f.stat().st_mtime for f in files), default=0)
+        }
+
+    def available_years(self):
+        """Lista os anos gravados a partir dos nomes das partições, sem ler os arquivos"""
+        years = set()
+        for path in self.root.glob('Ano=*'):
+            years.add(int(path.name.split('=', 1)[1]))
+        return sorted(years)
@@ -0,0 +1,179 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from cachetools import LRUCache
+from joblib import Parallel, delayed
+
+
+class SeasonalForecaster:
+    """Tendência linear + sazonalidade mensal ajustadas em lote para todas as séries
+
+    Cada série (por padrão UF x País x Via de acesso) é uma coluna de uma matriz
+    meses x séries. Como todas compartilham o mesmo calendário, o modelo
+    log(1 + chegadas) ~ intercepto + tendência + indicadores de mês tem a mesma
+    matriz de projeto para todas: a pseudo-inversa é calculada uma vez e os
+    coeficientes de milhares de séries saem de um único produto de matrizes.
+    Os blocos de séries podem ser processados em paralelo com joblib, e os
+    modelos ajustados ficam em cache por versão do dataset.
+    """
+
+    series_keys = ['UF', 'País', 'Via de acesso']
+
+    def __init__(self, horizon=12, n_jobs=1, block_size=4096, max_models=8):
+        self.horizon = horizon
+        self.n_jobs = n_jobs
+        self.block_size = block_size
+        self.meses = ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho',
+                      'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro']
+        self._models = LRUCache(maxsize=max_models)
+        self._lock = threading.Lock()
+
+    def monthly_matrix(self, data, keys=None):
+        """Matriz meses x séries de Chegadas, com meses sem registro iguais a zero
+
+        `data` pode ser o cubo de agregados ou um DataFrame com Ano, Mês e as chaves.
+        """
+        available = data.dimensions if hasattr(data, 'rollup') else data.columns
+        keys = [key for key in (keys or self.series_keys) if key in available]
+        columns = keys + ['Ano', 'Mês']
+        if hasattr(data, 'rollup'):
+            monthly = data.rollup(columns)
+        else:
+            monthly = data.groupby(columns, observed=True)['Chegadas'].sum().reset_index()
+
+        # Mês categórico ordenado já traz a posição do mês; texto é mapeado pela lista
+        month = monthly['Mês']
+        if isinstance(month.dtype, pd.CategoricalDtype):
+            month_codes = month.cat.codes.to_numpy()
+        else:
+            month_codes = pd.Categorical(month, categories=self.meses).codes
+        valid = month_codes >= 0
+        monthly = monthly[valid]
+        period = monthly['Ano'].to_numpy(dtype=np.int64) * 12 + month_codes[valid]
+
+        first = int(period.min())
+        n_periods = int(period.max()) - first + 1
+        if keys:
+            series_codes, series_index = pd.MultiIndex.from_frame(monthly[keys]).factorize()
+            series = series_index.to_frame(index=False)
+            series.columns = keys
+        else:
+            series_codes = np.zeros(len(monthly), dtype=np.intp)
+            series = pd.DataFrame(index=[0])
+
+        matrix = np.zeros((n_periods, len(series)), dtype=np.float64)
+        np.add.at(matrix, (period - first, series_codes), monthly['Chegadas'].to_numpy(dtype=np.float64))
+        return matrix, first, series
+
+    def design_matrix(self, first, n_periods, start=0):
+        """Intercepto, tendência e indicadores dos meses (janeiro é a referência)"""
+        steps = np.arange(start, start + n_periods)
+        months = (first + steps) % 12
+        design = np.zeros((n_periods, 14))
+        design[:, 0] = 1.0
+        design[:, 1] = steps
+        design[np.arange(n_periods), months + 2] = 1.0
+        # Coluna de janeiro removida para não haver colinearidade com o intercepto
+        return np.delete(design, 2, axis=1)
+
+    def _fit_block(self, design, solver, future, history):
+        """Coeficientes, previsão e erro de ajuste (escala log) de um bloco de séries"""
+        target = np.log1p(history)
+        coefficients = solver @ target
+        residuals = target - design @ coefficients
+        # Fator de smearing de Duan: corrige o viés de voltar da escala log para a média
+        smearing = np.exp(residuals).mean(axis=0)
+        forecast = np.clip(np.exp(future @ coefficients) * smearing - 1, 0, None)
+        rmse = np.sqrt((residuals ** 2).mean(axis=0))
+        return coefficients, forecast, rmse
+
+    def fit(self, data, version=None, keys=None):
+        """Ajusta (ou reaproveita do cache) o modelo de todas as séries do dataset"""
+        cache_key = (version, tuple(keys or self.series_keys), self.horizon)
+        if version is not None:
+            with self._lock:
+                model = self._models.get(cache_key)
+            if model is not None:
+                return model
+
+        history, first, series = self.monthly_matrix(data, keys)
+        n_periods = history.shape[0]
+        design = self.design_matrix(first, n_periods)
+        future = self.design_matrix(first, self.horizon, start=n_periods)
+        # Pseudo-inversa: funciona mesmo com menos de um ano de histórico
+        solver = np.linalg.pinv(design)
+
+        blocks = [
+            slice(start, start + self.block_size)
+            for start in range(0, history.shape[1], self.block_size)
+        ]
+        # Os produtos de matrizes liberam o GIL, então threads bastam e evitam copiar os blocos
+        results = Parallel(n_jobs=self.n_jobs, prefer='threads')(
+            delayed(self._fit_block)(design, solver, future, history[:, block]) for block in blocks
+        )
+
+        model = SeasonalModel(
+            series=series,
+            first_period=first,
+            history=history,
+            forecast=np.hstack([result[1] for result in results]),
+            coefficients=np.hstack([result[0] for result in results]),
+            rmse=np.concatenate([result[2] for result in results])
+        )
+        if version is not None:
+            with self._lock:
+                self._models[cache_key] = model
+        return model
+
+
+class SeasonalModel:
+    """Resultado do ajuste: histórico e previsão por série, em matrizes meses x séries"""
+
+    def __init__(self, series, first_period, history, forecast, coefficients, rmse):
+        self.series = series
+        self.first_period = first_period
+        self.history = history
+        self.forecast = forecast
+        self.coefficients = coefficients
+        self.rmse = rmse
+
+    def periods(self, start, count):
+        """Meses como Timestamp, a partir do índice ano * 12 + mês"""
+        index = self.first_period + start + np.arange(count)
+        return pd.to_datetime({'year': index // 12, 'month': index % 12 + 1, 'day': 1})
+
+    def mask(self, filters=None):
+        """Séries que atendem aos filtros (coluna -> lista de valores)"""
+        mask = np.ones(len(self.series), dtype=bool)
+        for column, values in (filters or {}).items():
+            if values and column in self.series.columns:
+                mask &= self.series[column].isin(values).to_numpy()
+        return mask
+
+    def frame(self, filters=None):
+        """Histórico e previsão somados sobre as séries filtradas, no formato longo"""
+        mask = self.mask(filters)
+        n_history, n_forecast = self.history.shape[0], self.forecast.shape[0]
+        history = pd.DataFrame({
+            'Período': self.periods(0, n_history),
+            'Chegadas': self.history[:, mask].sum(axis=1),
+            'Tipo': 'Histórico'
+        })
+        forecast = pd.DataFrame({
+            'Período': self.periods(n_history, n_forecast),
+            'Chegadas': self.forecast[:, mask].sum(axis=1).round(),
+            'Tipo': 'Previsão'
+        })
+        return pd.concat([history, forecast], ignore_index=True)
+
+    def summary(self, filters=None, top=None):
+        """Previsão dos próximos meses por série, comparada aos últimos 12 meses observados"""
+        mask = self.mask(filters)
+        table = self.series[mask].reset_index(drop=True)
+        table['Últimos 12 meses'] = self.history[-12:, mask].sum(axis=0).round()
+        table['Previsão'] = self.forecast[:, mask].sum(axis=0).round()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            table['Variação'] = table['Previsão'] / table['Últimos 12 meses'] - 1
+        table = table.sort_values('Previsão', ascending=False)
+        return table if top is None else table.head(top)
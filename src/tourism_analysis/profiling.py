@@ -0,0 +1,166 @@
+import functools
+import json
+import logging
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger('tourism_analysis.profiling')
+
+
+class _Frame:
+    """Etapa em andamento na pilha do profiler"""
+
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.child_seconds = 0.0
+        self.base = 0
+        self.peak = 0
+
+
+class Profiler:
+    """Tempos e memória por etapa do rerun atual
+
+    Desligado, `stage` não mede nada e `instrument` devolve o objeto intacto,
+    de modo que o custo em produção é praticamente nulo. Etapas aninhadas
+    recebem o nome da etapa externa como prefixo ("a > b").
+    """
+
+    def __init__(self, enabled=False, track_memory=False):
+        self.enabled = enabled
+        self.track_memory = enabled and track_memory
+        self.records = {}
+        self._stack = []
+
+    @classmethod
+    def from_env(cls):
+        """Configuração via TOURISM_PROFILING=1 e TOURISM_PROFILING_MEMORY=1"""
+        return cls(
+            enabled=os.environ.get('TOURISM_PROFILING') == '1',
+            track_memory=os.environ.get('TOURISM_PROFILING_MEMORY') == '1'
+        )
+
+    @contextmanager
+    def stage(self, name):
+        """Mede o bloco como uma etapa"""
+        if not self.enabled:
+            yield
+            return
+
+        if self._stack:
+            name = f"{self._stack[-1].name} > {name}"
+        if self.track_memory:
+            self._enter_memory()
+
+        frame = _Frame(name)
+        if self.track_memory:
+            frame.base = tracemalloc.get_traced_memory()[0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            seconds = time.perf_counter() - frame.start
+            if self.track_memory:
+                self._exit_memory(frame)
+            if self._stack:
+                self._stack[-1].child_seconds += seconds
+            self._record(frame, seconds)
+
+    def _enter_memory(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        # O pico da etapa externa é preservado antes de zerar a janela da interna
+        if self._stack:
+            parent = self._stack[-1]
+            parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+    def _exit_memory(self, frame):
+        frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+        if self._stack:
+            parent = self._stack[-1]
+            parent.peak = max(parent.peak, frame.peak)
+        tracemalloc.reset_peak()
+
+    def _record(self, frame, seconds):
+        record = self.records.setdefault(frame.name, {
+            'stage': frame.name,
+            'calls': 0,
+            'seconds': 0.0,
+            'self_seconds': 0.0,
+            'peak_bytes': None
+        })
+        record['calls'] += 1
+        record['seconds'] += seconds
+        record['self_seconds'] += seconds - frame.child_seconds
+        if self.track_memory:
+            # Pico acima do que já estava alocado ao entrar na etapa
+            record['peak_bytes'] = max(record['peak_bytes'] or 0, frame.peak - frame.base)
+
+    def instrument(self, obj, prefix, methods=None):
+        """Envolve os métodos do objeto em etapas nomeadas "prefixo.método"
+
+        Por padrão mede os métodos públicos; `methods` permite incluir outros.
+        """
+        if not self.enabled:
+            return obj
+
+        if methods is None:
+            methods = [
+                name for name in dir(obj)
+                if not name.startswith('_') and callable(getattr(obj, name))
+            ]
+        for name in methods:
+            setattr(obj, name, self._wrap(getattr(obj, name), f"{prefix}.{name}"))
+        return obj
+
+    def _wrap(self, method, name):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            with self.stage(name):
+                return method(*args, **kwargs)
+        return wrapper
+
+    def summary(self):
+        """Registros por etapa, na ordem em que foram concluídas pela primeira vez"""
+        return list(self.records.values())
+
+    def log_records(self):
+        """Emite um log estruturado (JSON) por etapa"""
+        for record in self.summary():
+            logger.info(json.dumps(record, ensure_ascii=False))
+
+    def to_prometheus(self):
+        """Registros no formato texto do Prometheus (textfile collector)"""
+        metrics = [
+            ('tourism_stage_seconds', 'seconds', 'Duração total da etapa no último rerun'),
+            ('tourism_stage_self_seconds', 'self_seconds', 'Duração da etapa sem as etapas internas'),
+            ('tourism_stage_calls', 'calls', 'Chamadas da etapa no último rerun'),
+            ('tourism_stage_peak_bytes', 'peak_bytes', 'Pico de memória alocada além do uso ao entrar na etapa')
+        ]
+
+        lines = []
+        for metric, field, help_text in metrics:
+            samples = [r for r in self.summary() if r[field] is not None]
+            if not samples:
+                continue
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            for record in samples:
+                label = _escape_label(record['stage'])
+                lines.append(f'{metric}{{stage="{label}"}} {record[field]}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """Grava as métricas de forma atômica para o textfile collector"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+
+def _escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -1,17 +1,36 @@
 import plotly.express as px
+import numpy as np
 import pandas as pd
-import streamlit as st
+
+from .payload import heatmap_matrix, lttb
 
 class ChartBuilder:
+    def __init__(self, max_points=2000, webgl_threshold=500, region=None):
+        # Orçamento de pontos por série e a partir de quantos pontos usar WebGL
+        self.max_points = max_points
+        self.webgl_threshold = webgl_threshold
+        # Nome da região ativa (RegionRegistry.region), usado nos títulos
+        self.region = region
+    
+    def _region_title(self, title):
+        """Título com o nome da região, quando informado"""
+        return f"{title} na região {self.region}" if self.region else title
+    
+    def _aggregate(self, data, keys):
+        """Soma de Chegadas por chave, lida do backend de consulta (cubo em memória ou Arrow) quando disponível"""
+        if hasattr(data, 'rollup'):
+            return data.rollup(keys)
+        return data.groupby(keys, observed=True)['Chegadas'].sum().reset_index()
+    
     def create_trend_chart(self, data):
         """Cria gráfico de tendência temporal"""
-        yearly_data = data.groupby('Ano')['Chegadas'].sum().reset_index()
+        yearly_data = self._aggregate(data, ['Ano'])
         
         fig = px.line(
             yearly_data, 
             x='Ano', 
             y='Chegadas',
-            title='📈 Evolução das Chegadas de Turistas no Nordeste',
+            title=self._region_title('📈 Evolução das Chegadas de Turistas'),
             markers=True
         )
         fig.update_layout(
@@ -23,14 +42,14 @@ class ChartBuilder:
     
     def create_top_states_chart(self, data):
         """Cria gráfico dos estados mais visitados"""
-        state_data = data.groupby('UF')['Chegadas'].sum().reset_index()
+        state_data = self._aggregate(data, ['UF'])
         state_data = state_data.sort_values('Chegadas', ascending=True)  # Para barras horizontais
         
         fig = px.bar(
             state_data,
             y='UF',
             x='Chegadas',
-            title='🗺️ Chegadas por Estado do Nordeste',
+            title=self._region_title('🗺️ Chegadas por Estado'),
             color='Chegadas',
             color_continuous_scale='viridis',
             orientation='h'
@@ -40,7 +59,7 @@ class ChartBuilder:
     
     def create_continent_chart(self, data):
         """Cria gráfico por continente de origem"""
-        continent_data = data.groupby('Continente')['Chegadas'].sum().reset_index()
+        continent_data = self._aggregate(data, ['Continente'])
         
         fig = px.pie(
             continent_data,
@@ -52,7 +71,7 @@ class ChartBuilder:
     
     def create_transport_chart(self, data):
         """Cria gráfico por via de acesso"""
-        via_data = data.groupby('Via de acesso')['Chegadas'].sum().reset_index()
+        via_data = self._aggregate(data, ['Via de acesso'])
         
         fig = px.bar(
             via_data,
@@ -65,26 +84,30 @@ class ChartBuilder:
     
     def create_heatmap_chart(self, data):
         """Cria mapa de calor por mês e estado"""
-        heatmap_data = data.groupby(['UF', 'Mês'])['Chegadas'].sum().reset_index()
+        heatmap_data = self._aggregate(data, ['UF', 'Mês'])
         
         # Ordenar meses corretamente
         meses_order = ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho',
                       'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro']
         heatmap_data['Mês'] = pd.Categorical(heatmap_data['Mês'], categories=meses_order, ordered=True)
         
-        fig = px.density_heatmap(
-            heatmap_data,
-            x='Mês',
-            y='UF',
-            z='Chegadas',
+        # Matriz já agregada no servidor: o navegador recebe UF x Mês, sem binning
+        matrix = heatmap_matrix(heatmap_data, x='Mês', y='UF', z='Chegadas', x_order=meses_order)
+        
+        fig = px.imshow(
+            matrix.to_numpy(),
+            x=[str(mes) for mes in matrix.columns],
+            y=[str(uf) for uf in matrix.index],
+            labels={'x': 'Mês', 'y': 'UF', 'color': 'Chegadas'},
             title='🔥 Mapa de Calor: Chegadas por Estado e Mês',
-            color_continuous_scale='viridis'
+            color_continuous_scale='viridis',
+            aspect='auto'
         )
         return fig
     
     def create_monthly_trend_chart(self, data):
         """Cria gráfico de tendência mensal"""
-        monthly_data = data.groupby(['Ano', 'Mês'])['Chegadas'].sum().reset_index()
+        monthly_data = self._aggregate(data, ['Ano', 'Mês'])
         
         # Ordenar meses
         meses_order = ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho',
@@ -92,15 +115,58 @@ class ChartBuilder:
         monthly_data['Mês'] = pd.Categorical(monthly_data['Mês'], categories=meses_order, ordered=True)
         monthly_data = monthly_data.sort_values(['Ano', 'Mês'])
         
-        monthly_data['Ano-Mês'] = monthly_data['Ano'].astype(str) + '-' + monthly_data['Mês']
+        # Séries longas são reduzidas com LTTB, preservando picos e vales
+        if len(monthly_data) > self.max_points:
+            keep = lttb(np.arange(len(monthly_data)), monthly_data['Chegadas'], self.max_points)
+            monthly_data = monthly_data.iloc[keep]
+        
+        monthly_data['Ano-Mês'] = monthly_data['Ano'].astype(str) + '-' + monthly_data['Mês'].astype(str)
         
         fig = px.line(
             monthly_data,
             x='Ano-Mês',
             y='Chegadas',
             title='📅 Tendência Mensal de Chegadas',
-            markers=True
+            markers=True,
+            render_mode='webgl' if len(monthly_data) > self.webgl_threshold else 'svg'
         )
         fig.update_layout(xaxis_title='Ano-Mês', yaxis_title='Chegadas')
         fig.update_xaxes(tickangle=45)
-        return fig
\ No newline at end of file
+        return fig
+    
+    def create_forecast_chart(self, forecast_data):
+        """Cria gráfico do histórico mensal seguido da previsão"""
+        fig = px.line(
+            forecast_data,
+            x='Período',
+            y='Chegadas',
+            color='Tipo',
+            title='🔮 Previsão de Chegadas para os Próximos Meses',
+            markers=True
+        )
+        fig.update_layout(xaxis_title='Mês', yaxis_title='Chegadas', hovermode='x unified')
+        return fig
+    
+    def create_drilldown_chart(self, children_data):
+        """Cria gráfico do nível atual do drill-down (filhos do caminho escolhido)"""
+        level = children_data.columns[0]
+        title = f"🧭 Chegadas por {level}"
+        # Só os valores presentes, na ordem recebida (categorias sem dados ficam de fora)
+        children_data = children_data.assign(**{level: children_data[level].astype(str)})
+        
+        if level == 'Mês':
+            # Meses em ordem de calendário, como série temporal
+            fig = px.line(children_data, x=level, y='Chegadas', title=title, markers=True)
+        else:
+            fig = px.bar(
+                children_data.sort_values('Chegadas', ascending=True),
+                y=level,
+                x='Chegadas',
+                title=title,
+                color='Chegadas',
+                color_continuous_scale='viridis',
+                orientation='h',
+                hover_data={'Participação': ':.1%'}
+            )
+        fig.update_layout(xaxis_title=None if level == 'Mês' else 'Chegadas')
+        return fig
@@ -0,0 +1,62 @@
+import math
+
+import numpy as np
+
+
+def lttb(x, y, threshold):
+    """Índices dos pontos mantidos pelo Largest-Triangle-Three-Buckets
+
+    Preserva o primeiro e o último ponto e, em cada bucket intermediário, o
+    ponto que forma o maior triângulo com o ponto anterior escolhido e a média
+    do bucket seguinte, mantendo picos e vales da série.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # threshold - 2 buckets entre o primeiro e o último ponto
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+
+    return selected
+
+
+def page_count(total_rows, page_size):
+    """Quantidade de páginas para o total de linhas"""
+    return max(1, math.ceil(total_rows / page_size))
+
+
+def page_slice(page, page_size, total_rows):
+    """Intervalo de linhas de uma página (começando em 1); só ele vai para o navegador"""
+    page = min(max(page, 1), page_count(total_rows, page_size))
+    start = (page - 1) * page_size
+    return slice(start, min(start + page_size, total_rows))
+
+
+def heatmap_matrix(data, x, y, z, x_order=None, y_order=None):
+    """Matriz já agregada (linhas y, colunas x) para um heatmap sem binning no navegador"""
+    matrix = data.pivot_table(index=y, columns=x, values=z, aggfunc='sum', observed=True)
+    if x_order is not None:
+        matrix = matrix.reindex(columns=[value for value in x_order if value in matrix.columns])
+    if y_order is not None:
+        matrix = matrix.reindex(index=[value for value in y_order if value in matrix.index])
+    return matrix
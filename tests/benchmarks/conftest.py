@@ -0,0 +1,58 @@
+import json
+import os
+import warnings
+from pathlib import Path
+
+import pytest
+
+from .harness import (
+    BASELINE_PATH,
+    ROUNDS,
+    STRICT,
+    THRESHOLD,
+    BenchmarkRegression,
+    load_baseline,
+    measure,
+    results,
+)
+
+
+@pytest.fixture
+def bench(request):
+    """Mede a função, registra o resultado e compara com o baseline"""
+    name = request.node.nodeid.split('::', 1)[1]
+
+    def run(fn, rounds=ROUNDS):
+        result, seconds, peak = measure(fn, rounds)
+        results[name] = {'seconds': seconds, 'peak_bytes': peak}
+
+        baseline = load_baseline().get(name)
+        if baseline and seconds > baseline['seconds'] * (1 + THRESHOLD):
+            message = (
+                f"{name}: {seconds:.4f}s contra baseline de {baseline['seconds']:.4f}s "
+                f"(tolerância {THRESHOLD:.0%})"
+            )
+            if STRICT:
+                pytest.fail(message)
+            warnings.warn(message, BenchmarkRegression)
+        return result
+
+    return run
+
+
+@pytest.fixture(scope='session', autouse=True)
+def bench_output(tmp_path_factory):
+    """Grava os resultados ao fim da sessão; sem TOURISM_BENCH_OUTPUT, no diretório temporário do pytest"""
+    output = os.environ.get('TOURISM_BENCH_OUTPUT')
+    output = Path(output) if output else tmp_path_factory.getbasetemp() / 'benchmark_results.json'
+    yield output
+    if not results:
+        return
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, sort_keys=True), encoding='utf-8')
+
+    if os.environ.get('TOURISM_BENCH_SAVE') == '1':
+        baseline = load_baseline()
+        baseline.update(results)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True), encoding='utf-8')
@@ -0,0 +1,52 @@
+"""Infraestrutura leve de benchmarks (tempo e pico de memória) para o pipeline
+
+Variáveis de ambiente:
+- TOURISM_BENCH_SIZES: tamanhos dos datasets, separados por vírgula (padrão: 10000)
+- TOURISM_BENCH_ROUNDS: repetições por medição; vale o menor tempo (padrão: 3)
+- TOURISM_BENCH_THRESHOLD: aumento relativo tolerado sobre o baseline (padrão: 0.5)
+- TOURISM_BENCH_STRICT: "1" faz regressões falharem o teste em vez de só avisar
+- TOURISM_BENCH_SAVE: "1" grava os resultados da execução como novo baseline
+- TOURISM_BENCH_OUTPUT: arquivo JSON com os resultados (padrão: benchmark_results.json no diretório
+  temporário da sessão do pytest)
+"""
+import json
+import os
+import time
+import tracemalloc
+from pathlib import Path
+
+BASELINE_PATH = Path(__file__).with_name('baseline.json')
+SIZES = [int(size) for size in os.environ.get('TOURISM_BENCH_SIZES', '10000').split(',')]
+ROUNDS = int(os.environ.get('TOURISM_BENCH_ROUNDS', '3'))
+THRESHOLD = float(os.environ.get('TOURISM_BENCH_THRESHOLD', '0.5'))
+STRICT = os.environ.get('TOURISM_BENCH_STRICT') == '1'
+
+results = {}
+
+
+class BenchmarkRegression(UserWarning):
+    """Medição acima do baseline mais a tolerância configurada"""
+
+
+def load_baseline():
+    if BASELINE_PATH.exists():
+        return json.loads(BASELINE_PATH.read_text(encoding='utf-8'))
+    return {}
+
+
+def measure(fn, rounds=ROUNDS):
+    """Menor tempo entre as repetições e pico de memória de uma execução extra"""
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, min(times), peak
@@ -0,0 +1,160 @@
+import json
+
+import pytest
+
+from tourism_analysis.data.cache import FigureCache
+from tourism_analysis.data.collector import DataCollector
+from tourism_analysis.data.cube import RollupCube
+from tourism_analysis.data.drilldown import DrillDown
+from tourism_analysis.data.processor import DataProcessor
+from tourism_analysis.data.query import ArrowBackend
+from tourism_analysis.data.store import DatasetStore
+from tourism_analysis.models.predictor import SeasonalForecaster
+from tourism_analysis.visualization.charts import ChartBuilder
+
+from .harness import SIZES
+
+CHART_METHODS = [
+    'create_trend_chart',
+    'create_top_states_chart',
+    'create_continent_chart',
+    'create_transport_chart',
+    'create_heatmap_chart',
+    'create_monthly_trend_chart'
+]
+
+
+@pytest.fixture(scope='session')
+def raw_datasets():
+    """Datasets gerados uma vez por tamanho e reaproveitados entre os benchmarks"""
+    cache = {}
+
+    def get(size):
+        if size not in cache:
+            cache[size] = DataCollector().generate_sample_data(records=size, seed=0)
+        return cache[size]
+
+    return get
+
+
+@pytest.fixture(scope='session')
+def consolidated(raw_datasets):
+    cache = {}
+
+    def get(size):
+        if size not in cache:
+            data = DataProcessor().consolidate_data(raw_datasets(size))
+            cache[size] = {'frame': data, 'cube': RollupCube(data)}
+        return cache[size]
+
+    return get
+
+
+@pytest.fixture(scope='session')
+def stored(consolidated, tmp_path_factory):
+    """Store Parquet por tamanho, para o backend Arrow"""
+    cache = {}
+
+    def get(size):
+        if size not in cache:
+            store = DatasetStore(tmp_path_factory.mktemp(f'store_{size}'))
+            store.write(consolidated(size)['frame'])
+            cache[size] = store
+        return cache[size]
+
+    return get
+
+
+def test_get_sample_data_quick(bench):
+    datasets = bench(DataCollector().get_sample_data_quick)
+    assert len(datasets['SAMPLE_DATA']) == 10000
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_generate_sample_data(bench, size):
+    datasets = bench(lambda: DataCollector().generate_sample_data(records=size, seed=0))
+    assert len(datasets['SAMPLE_DATA']) == size
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_consolidate_data(bench, size, raw_datasets):
+    datasets = raw_datasets(size)
+    data = bench(lambda: DataProcessor().consolidate_data(datasets))
+    assert len(data) == size
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_rollup_cube(bench, size, consolidated):
+    data = consolidated(size)['frame']
+    cube = bench(lambda: RollupCube(data))
+    assert cube.total() == data['Chegadas'].sum()
+
+
+@pytest.mark.parametrize('source', ['frame', 'cube'])
+@pytest.mark.parametrize('method', CHART_METHODS)
+@pytest.mark.parametrize('size', SIZES)
+def test_chart(bench, size, method, source, consolidated):
+    data = consolidated(size)[source]
+    # Cubo novo a cada rodada, para medir também o rollup e não só o cache
+    if source == 'cube':
+        build = lambda: getattr(ChartBuilder(), method)(RollupCube.from_base(data.base, data.dimensions))
+    else:
+        build = lambda: getattr(ChartBuilder(), method)(data)
+    fig = bench(build)
+    assert fig is not None
+
+
+@pytest.mark.parametrize('method', CHART_METHODS)
+@pytest.mark.parametrize('size', SIZES)
+def test_figure_cache_hit(bench, size, method, consolidated):
+    cube = consolidated(size)['cube']
+    figures = FigureCache()
+    key = figures.key('bench', method)
+    expected = figures.get_or_build(key, lambda: getattr(ChartBuilder(), method)(cube))
+    # Só acertos: a figura vem do JSON, sem o Plotly Express
+    fig = bench(lambda: figures.get_or_build(key, lambda: pytest.fail("figura reconstruída")))
+    assert json.loads(fig.to_json()) == json.loads(expected.to_json())
+    assert figures.stats()['misses'] == 1
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_seasonal_forecast(bench, size, consolidated):
+    cube = consolidated(size)['cube']
+    # Sem versão: o ajuste é refeito a cada rodada em vez de vir do cache
+    model = bench(lambda: SeasonalForecaster().fit(cube))
+    assert model.forecast.shape == (12, len(model.series))
+
+
+@pytest.mark.parametrize('size', SIZES)
+def test_drilldown(bench, size, consolidated):
+    data = consolidated(size)['frame']
+    cube = consolidated(size)['cube']
+
+    def drill():
+        # Drill-down novo a cada rodada: agregados por nível e descida até o mês
+        drilldown = DrillDown(cube, filters={'Ano': (2020, 2022)})
+        path = []
+        for level in drilldown.hierarchy:
+            children = drilldown.children(path)
+            path.append(children.loc[children['Chegadas'].idxmax(), level])
+        return drilldown, path
+
+    drilldown, path = bench(drill)
+    expected = data['Ano'].between(2020, 2022)
+    for level, value in zip(drilldown.hierarchy, path):
+        expected &= data[level] == value
+    assert drilldown.total(path) == data.loc[expected, 'Chegadas'].sum()
+
+
+@pytest.mark.parametrize('backend', ['pandas', 'arrow'])
+@pytest.mark.parametrize('size', SIZES)
+def test_query_backend(bench, size, backend, consolidated, stored):
+    data = consolidated(size)['frame']
+    # Backend novo a cada rodada: mede a consulta, não a memoização
+    if backend == 'arrow':
+        store = stored(size)
+        query = lambda: ArrowBackend(store).select({'Ano': (2020, 2022)}).rollup(['UF', 'Mês'])
+    else:
+        query = lambda: RollupCube(data).select({'Ano': (2020, 2022)}).rollup(['UF', 'Mês'])
+    result = bench(query)
+    assert result['Chegadas'].sum() == data.loc[data['Ano'].between(2020, 2022), 'Chegadas'].sum()
@@ -0,0 +1,18 @@
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def write_year_csv(tmp_path):
+    """Grava um CSV anual no formato da fonte (sep ';', latin-1) e retorna o caminho"""
+    directory = tmp_path / 'dados'
+    directory.mkdir()
+
+    def write(year, rows):
+        frame = pd.DataFrame(rows, columns=['Continente', 'País', 'UF', 'Via de acesso', 'Mês', 'Chegadas'])
+        frame['ano'] = year
+        path = directory / f'CHEGADAS_{year}.csv'
+        frame.to_csv(path, sep=';', encoding='latin-1', index=False)
+        return path
+
+    return write
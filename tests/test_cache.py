@@ -0,0 +1,57 @@
+import pytest
+
+from tourism_analysis.data.cache import DatasetCache
+from tourism_analysis.data.collector import DataCollector
+from tourism_analysis.data.cube import RollupCube
+from tourism_analysis.data.filters import FilterEngine
+from tourism_analysis.data.processor import DataProcessor
+
+
+@pytest.fixture(scope='module')
+def data():
+    return DataProcessor().consolidate_data(DataCollector().generate_sample_data(years=2, records=20_000, seed=5))
+
+
+def test_size_counts_filter_indexes(data):
+    engine = FilterEngine(data)
+    assert DatasetCache.size_of(engine) == 0
+
+    engine.build()
+    # Código int32 e posição intp por linha em cada dimensão, mais os offsets
+    per_row = 4 + engine.index('UF')['order'].itemsize
+    dimensions = [column for column in FilterEngine.dimensions if column in data.columns]
+    assert DatasetCache.size_of(engine) >= per_row * len(data) * len(dimensions)
+
+
+def test_size_counts_cube_rollups_and_indexes(data):
+    cube = RollupCube(data)
+    base = DatasetCache.size_of(cube)
+    assert base == DatasetCache.size_of(cube.base)
+
+    rollup = cube.rollup(['UF', 'Mês'])
+    cube.filters.build()
+    assert DatasetCache.size_of(cube) == base + DatasetCache.size_of(rollup) + cube.filters.nbytes
+
+
+def test_get_measures_entry_again(data):
+    cube = RollupCube(data)
+    cache = DatasetCache(max_bytes=1 << 30)
+    cache.put('dataset', {'data': data, 'cube': cube, 'filters': FilterEngine(data)})
+    before = cache.stats()['bytes']
+
+    # Índices construídos depois do put entram na próxima leitura
+    entry = cache.get('dataset')
+    entry['filters'].build()
+    cache.get('dataset')
+    assert cache.stats()['bytes'] == before + entry['filters'].nbytes
+
+
+def test_entry_grown_past_budget_is_dropped(data):
+    engine = FilterEngine(data)
+    cache = DatasetCache(max_bytes=1024)
+    cache.put('engine', engine)
+
+    engine.build()
+    assert cache.get('engine') is engine
+    assert cache.get('engine') is None
+    assert cache.stats()['entries'] == 0
@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from tourism_analysis.cli import main
+from tourism_analysis.data.processor import DataProcessor
+from tourism_analysis.data.store import DatasetStore
+
+ROWS = [
+    ('Europa', 'Portugal', 'Bahia', 'Aérea', 'janeiro', 10),
+    ('América', 'Argentina', 'Ceará', 'Terrestre', 'fevereiro', 20),
+    ('Europa', 'França', 'São Paulo', 'Aérea', 'março', 30),
+]
+
+
+def run(tmp_path, *args):
+    return main([*args, '--store', str(tmp_path / 'store'), '--saida', str(tmp_path / 'saida')])
+
+
+def test_files_with_workers_and_profiling(tmp_path, write_year_csv):
+    # Métodos instrumentados pelo Profiler não podem ir para o pool de processos
+    for year in (2021, 2022):
+        path = write_year_csv(year, ROWS)
+
+    assert run(tmp_path, '--arquivos', str(path.parent), '--workers', '2', '--perfil', '--formatos', 'csv') == 0
+
+    by_year = pd.read_parquet(tmp_path / 'saida' / 'agregados' / 'por_ano.parquet')
+    assert by_year.set_index('Ano')['Chegadas'].to_dict() == {2021: 30, 2022: 30}
+    assert len(pd.read_csv(tmp_path / 'saida' / 'turismo_nordeste.csv')) == 4
+
+
+def test_quick_sample(tmp_path):
+    assert run(tmp_path, '--modo', 'rapido', '--formatos', 'parquet') == 0
+    assert len(pd.read_parquet(tmp_path / 'saida' / 'turismo_nordeste.parquet')) == 10_000
+
+
+def test_unknown_region(tmp_path):
+    assert run(tmp_path, '--modo', 'rapido', '--regiao', 'Atlântida') == 2
+
+
+def test_empty_sample_keeps_previous_store(tmp_path, monkeypatch):
+    assert run(tmp_path, '--modo', 'rapido', '--formatos') == 0
+
+    monkeypatch.setattr(DataProcessor, 'consolidate_data', lambda self, datasets: pd.DataFrame())
+    with pytest.raises(SystemExit, match='Nenhum dado foi consolidado'):
+        run(tmp_path, '--modo', 'completo', '--formatos')
+
+    assert len(DatasetStore(tmp_path / 'store').read()) == 10_000
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from tourism_analysis.data.cube import RollupCube
+from tourism_analysis.data.drilldown import DrillDown
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=['Ano', 'Continente', 'País', 'UF', 'Mês', 'Via de acesso', 'Chegadas'])
+
+
+@pytest.fixture
+def data():
+    return frame([
+        (2022, 'Europa', 'Portugal', 'BA', 'Janeiro', 'Aérea', 10),
+        (2022, 'Europa', 'Portugal', 'PE', 'Janeiro', 'Aérea', 5),
+        (2022, 'Europa', 'Itália', 'BA', 'Fevereiro', 'Marítima', 7),
+        (2023, 'Europa', 'Portugal', 'BA', 'Janeiro', 'Aérea', 3),
+        (2023, 'América do Sul', 'Argentina', 'CE', 'Março', 'Terrestre', 8),
+        (2023, 'América do Sul', 'Argentina', 'BA', 'Março', 'Aérea', 4),
+    ])
+
+
+def levels_of(drill):
+    return [level.sort_index() for level in drill.levels]
+
+
+def test_children_and_total_match_groupby(data):
+    drill = DrillDown(RollupCube(data))
+
+    assert drill.total() == data['Chegadas'].sum()
+    assert drill.total(('Europa', 'Portugal')) == 18
+
+    expected = data.groupby('Continente')['Chegadas'].sum()
+    children = drill.children().set_index('Continente')['Chegadas']
+    pd.testing.assert_series_equal(children.sort_index(), expected.sort_index(), check_names=False)
+
+    states = drill.children(('Europa', 'Portugal')).set_index('UF')
+    assert states['Chegadas'].to_dict() == {'BA': 13, 'PE': 5}
+    assert states['Participação'].sum() == pytest.approx(1.0)
+
+
+def test_children_of_missing_path_is_empty(data):
+    assert DrillDown(RollupCube(data)).children(('Oceania',)).empty
+
+
+def test_select_matches_new_query(data):
+    drill = DrillDown(RollupCube(data))
+    drill.levels
+
+    selected = drill.select({'UF': ['BA']})
+    expected = DrillDown(RollupCube(data[data['UF'] == 'BA']))
+    for got, want in zip(levels_of(selected), levels_of(expected)):
+        pd.testing.assert_series_equal(got, want)
+
+
+def test_update_appends_new_partition(data):
+    drill = DrillDown(RollupCube(data[data['Ano'] == 2022]))
+    drill.update(data[data['Ano'] == 2023])
+
+    for got, want in zip(levels_of(drill), levels_of(DrillDown(RollupCube(data)))):
+        pd.testing.assert_series_equal(got, want)
+
+
+def test_update_with_replaced_partition_matches_rebuild(data):
+    drill = DrillDown(RollupCube(data))
+    old = data[data['Ano'] == 2023]
+    new = frame([
+        (2023, 'Europa', 'Portugal', 'BA', 'Janeiro', 'Aérea', 6),
+        (2023, 'Europa', 'Itália', 'PE', 'Abril', 'Aérea', 2),
+    ])
+    drill.update(new, replaced=old)
+
+    rebuilt = DrillDown(RollupCube(pd.concat([data[data['Ano'] == 2022], new], ignore_index=True)))
+    for got, want in zip(levels_of(drill), levels_of(rebuilt)):
+        pd.testing.assert_series_equal(got, want, check_dtype=False)
+    assert 'América do Sul' not in drill.children()['Continente'].tolist()
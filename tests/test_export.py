@@ -0,0 +1,76 @@
+import gzip
+import threading
+
+import pandas as pd
+import pytest
+
+from tourism_analysis.data.export import DatasetExporter
+from tourism_analysis.data.filters import FilterEngine
+
+
+@pytest.fixture
+def data():
+    return pd.DataFrame({
+        'Ano': [2021, 2021, 2022, 2022, 2023],
+        'UF': ['Bahia', 'Ceará', 'Bahia', 'Piauí', 'Ceará'],
+        'Chegadas': [10, 20, 30, 40, 50]
+    })
+
+
+def read(path, fmt):
+    if fmt == 'parquet':
+        return pd.read_parquet(path)
+    return pd.read_csv(path, compression='gzip' if fmt == 'csv.gz' else None)
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'csv.gz', 'parquet'])
+def test_export_in_chunks_matches_filtered_rows(tmp_path, data, fmt):
+    exporter = DatasetExporter(tmp_path, chunk_size=2)
+    filters = {'Ano': (2021, 2022)}
+
+    path = exporter.export(FilterEngine(data), filters, 'v1', fmt)
+
+    expected = data[data['Ano'].between(2021, 2022)].reset_index(drop=True)
+    pd.testing.assert_frame_equal(read(path, fmt), expected, check_dtype=False)
+    assert exporter.cached_path('v1', filters, fmt) == path
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'csv.gz', 'parquet'])
+def test_empty_result_keeps_header(tmp_path, data, fmt):
+    path = DatasetExporter(tmp_path).export(FilterEngine(data), {'UF': ['Sergipe']}, 'v1', fmt)
+
+    result = read(path, fmt)
+    assert result.empty
+    assert list(result.columns) == list(data.columns)
+
+
+def test_concurrent_exports_of_same_key(tmp_path, data):
+    exporter = DatasetExporter(tmp_path, chunk_size=1)
+    engine = FilterEngine(data)
+    errors = []
+
+    def export():
+        try:
+            exporter.write(engine, {}, 'csv.gz', tmp_path / 'turismo.csv.gz')
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=export) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with gzip.open(tmp_path / 'turismo.csv.gz', 'rt') as f:
+        pd.testing.assert_frame_equal(pd.read_csv(f), data)
+    # Nenhum temporário fica no diretório
+    assert [path.name for path in tmp_path.iterdir()] == ['turismo.csv.gz']
+
+
+def test_evicts_oldest_files(tmp_path, data):
+    exporter = DatasetExporter(tmp_path, max_files=2)
+    for version in ['v1', 'v2', 'v3']:
+        exporter.export(FilterEngine(data), {}, version, 'csv')
+    assert exporter.cached_path('v1', {}, 'csv') is None
+    assert exporter.cached_path('v3', {}, 'csv') is not None
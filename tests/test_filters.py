@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from tourism_analysis.data.collector import DataCollector
+from tourism_analysis.data.cube import RollupCube
+from tourism_analysis.data.filters import FilterEngine
+from tourism_analysis.data.processor import DataProcessor
+
+
+@pytest.fixture(scope='module')
+def data():
+    processor = DataProcessor()
+    return processor.consolidate_data(DataCollector().generate_sample_data(years=3, records=5_000, seed=7))
+
+
+def expected_mask(data, filters):
+    """Mesmo filtro com máscaras booleanas do pandas"""
+    mask = pd.Series(True, index=data.index)
+    for column, condition in filters.items():
+        if isinstance(condition, tuple):
+            mask &= (data[column] >= condition[0]) & (data[column] <= condition[1])
+        else:
+            mask &= data[column].isin(condition)
+    return mask
+
+
+FILTERS = [
+    {'Mês': ('janeiro', 'março')},
+    {'Mês': ('outubro', 'dezembro')},
+    {'UF': ('Bahia', 'Pernambuco')},
+    {'Ano': (2020, 2021)},
+    {'País': ['Portugal', 'Argentina']},
+    {'Ano': (2021, 2021), 'Mês': ('junho', 'agosto'), 'Via de acesso': ['Aérea']},
+]
+
+
+@pytest.mark.parametrize('filters', FILTERS, ids=str)
+def test_matches_boolean_mask(data, filters):
+    engine = FilterEngine(data)
+    mask = expected_mask(data, filters)
+
+    assert engine.count(filters) == mask.sum()
+    pd.testing.assert_frame_equal(engine.select(filters), data[mask])
+
+
+def test_range_on_unordered_strings():
+    data = pd.DataFrame({'País': ['Chile', 'Alemanha', 'Itália', 'Espanha'], 'Chegadas': [1, 2, 3, 4]})
+    for frame in (data, data.astype({'País': 'category'})):
+        selected = FilterEngine(frame).select({'País': ('B', 'F')})
+        assert selected['Chegadas'].tolist() == [1, 4]
+
+
+def test_cube_select_matches_boolean_mask(data):
+    filters = {'Mês': ('janeiro', 'março'), 'UF': ['Ceará', 'Bahia']}
+    cube = RollupCube(data).select(filters)
+    assert cube.total() == data.loc[expected_mask(data, filters), 'Chegadas'].sum()
+
+
+def test_ignores_missing_filters(data):
+    engine = FilterEngine(data)
+    assert engine.count({'UF': None}) == len(data)
+    assert engine.select({}) is data
@@ -0,0 +1,65 @@
+"""Orçamento de importação da aplicação (python -X importtime)
+
+A tela inicial não deve carregar pandas, numpy, pyarrow, plotly.express nem as
+bibliotecas de modelagem: elas são importadas quando há dados a exibir.
+TOURISM_IMPORT_BUDGET_MS ajusta o orçamento do próprio pacote (padrão: 150 ms,
+sem contar o Streamlit).
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+APP_DIR = Path(__file__).resolve().parents[1] / 'src' / 'tourism_analysis'
+SRC_DIR = APP_DIR.parent
+BUDGET_MS = float(os.environ.get('TOURISM_IMPORT_BUDGET_MS', 150))
+HEAVY_MODULES = ['pandas', 'numpy', 'pyarrow', 'plotly.express', 'sklearn', 'scipy', 'matplotlib', 'joblib']
+
+
+def run_python(code, cwd, *options, env=None):
+    result = subprocess.run(
+        [sys.executable, *options, '-c', code],
+        cwd=cwd, capture_output=True, text=True, env={**os.environ, **(env or {})}
+    )
+    assert result.returncode == 0, result.stderr
+    return result
+
+
+def loaded_heavy_modules(code, cwd, env=None):
+    """Módulos pesados presentes em sys.modules após executar `code`"""
+    check = f"{code}\nimport sys\nprint([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    return run_python(check, cwd, env=env).stdout.strip().splitlines()[-1]
+
+
+def cumulative_import_us(stderr):
+    """Tempo cumulativo (µs) da primeira importação de cada módulo"""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times.setdefault(name.strip(), int(cumulative))
+    return times
+
+
+def test_app_import_within_budget():
+    times = cumulative_import_us(run_python('import app', APP_DIR, '-X', 'importtime').stderr)
+    own_ms = (times['app'] - times.get('streamlit', 0)) / 1000
+    assert own_ms <= BUDGET_MS, f"app importa em {own_ms:.0f} ms além do Streamlit (orçamento: {BUDGET_MS:.0f} ms)"
+
+
+def test_app_import_skips_heavy_modules():
+    assert loaded_heavy_modules('import app', APP_DIR) == '[]'
+
+
+def test_welcome_screen_skips_heavy_modules(tmp_path):
+    # Sem dataset gravado a aplicação para na tela inicial (modo bare do Streamlit)
+    code = "import runpy\nrunpy.run_path('app.py', run_name='__main__')"
+    assert loaded_heavy_modules(code, APP_DIR, env={'TOURISM_DATA_DIR': str(tmp_path)}) == '[]'
+
+
+@pytest.mark.parametrize('module', ['tourism_analysis.cli', 'tourism_analysis.data.reporting', 'tourism_analysis.data.jobs'])
+def test_package_import_skips_heavy_modules(module):
+    assert loaded_heavy_modules(f'import {module}', SRC_DIR) == '[]'
@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from tourism_analysis.data.jobs import JobRunner
+
+
+@pytest.fixture
+def runner():
+    runner = JobRunner()
+    yield runner
+    runner.shutdown()
+
+
+def test_same_key_reuses_running_job(runner):
+    release = threading.Event()
+    calls = []
+
+    def task(reporter):
+        calls.append(1)
+        release.wait(5)
+        return 'pronto'
+
+    first = runner.submit('dataset', task)
+    second = runner.submit('dataset', task)
+    assert second is first
+    assert runner.active() == [first]
+
+    release.set()
+    assert first.result(5) == 'pronto'
+    assert first.status == 'concluido'
+    assert calls == [1]
+    assert runner.active() == []
+
+    # Job concluído não é reaproveitado: um novo pedido roda de novo
+    assert runner.submit('dataset', task) is not first
+
+
+def test_progress_and_messages(runner):
+    def task(reporter):
+        progress = reporter.progress(4)
+        progress.update(2, 'metade')
+        reporter.info('lendo')
+        reporter.warning('arquivo vazio')
+        progress.close('fim')
+
+    job = runner.submit('dataset', task, label='Preparando')
+    job.result(5)
+
+    assert job.label == 'Preparando'
+    assert job.fraction == 1.0
+    assert job.text == 'fim'
+    assert job.messages == [('info', 'lendo'), ('warning', 'arquivo vazio')]
+    assert job.started <= job.finished
+
+
+def test_failed_task_reports_error(runner):
+    def task(reporter):
+        raise ValueError('falhou')
+
+    job = runner.submit('dataset', task)
+    with pytest.raises(ValueError):
+        job.result(5)
+
+    assert job.status == 'erro'
+    assert isinstance(job.error, ValueError)
+    assert job.finished is not None
+
+
+def test_finished_jobs_pruned_after_retention():
+    runner = JobRunner(retention=0)
+    try:
+        job = runner.submit('antigo', lambda reporter: 1)
+        job.result(5)
+        assert runner.get('antigo') is job
+
+        job.finished -= 1
+        runner.submit('novo', lambda reporter: 2).result(5)
+        assert runner.get('antigo') is None
+        assert runner.get('novo') is not None
+    finally:
+        runner.shutdown()
@@ -0,0 +1,82 @@
+import os
+
+from tourism_analysis.data.manifest import SourceManifest
+from tourism_analysis.data.processor import DataProcessor
+from tourism_analysis.data.store import DatasetStore
+
+
+def rows(arrivals):
+    return [
+        ('Europa', 'Portugal', 'Bahia', 'Aérea', 'janeiro', arrivals),
+        ('América do Sul', 'Argentina', 'Ceará', 'Terrestre', 'fevereiro', arrivals + 1),
+    ]
+
+
+def test_changed_and_removed(tmp_path, write_year_csv):
+    first = write_year_csv(2021, rows(1))
+    second = write_year_csv(2022, rows(2))
+    manifest = SourceManifest(tmp_path / 'manifest.json')
+
+    files = {'CHEGADAS_2021': first, 'CHEGADAS_2022': second}
+    assert manifest.changed(files, '1') == files
+
+    manifest.record_file('CHEGADAS_2021', first, 2021, 2, '1')
+    manifest.save()
+    manifest = SourceManifest(tmp_path / 'manifest.json')
+
+    assert manifest.is_current('CHEGADAS_2021', first, '1')
+    assert manifest.changed(files, '1') == {'CHEGADAS_2022': second}
+    # Outra versão do esquema invalida o registro
+    assert not manifest.is_current('CHEGADAS_2021', first, '2')
+    assert manifest.removed({'CHEGADAS_2022': second}) == ['CHEGADAS_2021']
+
+    manifest.forget('CHEGADAS_2021')
+    assert manifest.removed({}) == []
+
+
+def test_touched_file_with_same_content_is_current(tmp_path, write_year_csv):
+    path = write_year_csv(2021, rows(1))
+    manifest = SourceManifest(tmp_path / 'manifest.json')
+    manifest.record_file('CHEGADAS_2021', path, 2021, 2, '1')
+
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 60))
+    assert manifest.is_current('CHEGADAS_2021', path, '1')
+
+    # Mesmo tamanho, conteúdo diferente: o hash detecta a mudança
+    write_year_csv(2021, rows(5))
+    os.utime(path, (stat.st_atime, stat.st_mtime + 120))
+    assert not manifest.is_current('CHEGADAS_2021', path, '1')
+
+
+def test_matches_generated(tmp_path):
+    manifest = SourceManifest(tmp_path / 'manifest.json')
+    params = {'years': 3, 'records': 100, 'seed': 7}
+    manifest.record_generated('SAMPLE', params, 300, '1')
+
+    assert manifest.matches_generated('SAMPLE', params, '1')
+    assert not manifest.matches_generated('SAMPLE', {**params, 'seed': 8}, '1')
+    assert not manifest.matches_generated('SAMPLE', params, '2')
+    assert not manifest.matches_generated('OUTRO', params, '1')
+
+
+def test_refresh_store_reprocesses_changed_year(tmp_path, write_year_csv):
+    files = {
+        'CHEGADAS_2021': write_year_csv(2021, rows(1)),
+        'CHEGADAS_2022': write_year_csv(2022, rows(2)),
+    }
+    processor = DataProcessor()
+    store = DatasetStore(tmp_path / 'store')
+
+    assert processor.refresh_store(files, store) == [2021, 2022]
+    assert processor.refresh_store(files, store) == []
+
+    write_year_csv(2022, rows(10))
+    assert processor.refresh_store(files, store) == [2022]
+
+    totals = store.read().groupby('Ano')['Chegadas'].sum().to_dict()
+    assert totals == {2021: 3, 2022: 21}
+
+    del files['CHEGADAS_2021']
+    assert processor.refresh_store(files, store) == [2021]
+    assert store.available_years() == [2022]
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tourism_analysis.visualization.payload import heatmap_matrix, lttb, page_count, page_slice
+
+MESES = ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho',
+         'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro']
+
+
+@pytest.mark.parametrize('threshold', [3, 50, 999])
+def test_lttb_keeps_endpoints_and_point_count(threshold):
+    x = np.arange(1_000)
+    y = np.sin(x / 20)
+    selected = lttb(x, y, threshold)
+
+    assert len(selected) == threshold
+    assert selected[0] == 0 and selected[-1] == len(x) - 1
+    assert (np.diff(selected) > 0).all()
+
+
+def test_lttb_keeps_spike():
+    y = np.zeros(500)
+    y[321] = 100
+    assert 321 in lttb(np.arange(500), y, 20)
+
+
+def test_lttb_small_series_unchanged():
+    assert lttb([0, 1, 2], [1, 2, 3], 10).tolist() == [0, 1, 2]
+    assert lttb(range(10), range(10), 2).tolist() == list(range(10))
+
+
+def test_page_slice_last_partial_page():
+    assert page_count(95, 20) == 5
+    assert page_slice(5, 20, 95) == slice(80, 95)
+    # Páginas fora do intervalo ficam na primeira ou na última
+    assert page_slice(9, 20, 95) == slice(80, 95)
+    assert page_slice(0, 20, 95) == slice(0, 20)
+    assert page_slice(1, 20, 0) == slice(0, 0)
+
+
+def test_heatmap_matrix_columns_in_calendar_order():
+    data = pd.DataFrame({
+        'UF': ['Bahia', 'Bahia', 'Ceará', 'Ceará', 'Bahia'],
+        'Mês': ['março', 'janeiro', 'dezembro', 'janeiro', 'março'],
+        'Chegadas': [1, 2, 3, 4, 5],
+    })
+    matrix = heatmap_matrix(data, x='Mês', y='UF', z='Chegadas', x_order=MESES, y_order=['Ceará', 'Bahia'])
+
+    assert matrix.columns.tolist() == ['janeiro', 'março', 'dezembro']
+    assert matrix.index.tolist() == ['Ceará', 'Bahia']
+    assert matrix.loc['Bahia', 'março'] == 6
+    assert np.isnan(matrix.loc['Ceará', 'março'])
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tourism_analysis.models.predictor import SeasonalForecaster
+
+MESES = ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho',
+         'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro']
+SEASON = np.array([0.5, -0.2, -0.3, -0.1, 0.0, 0.1, 0.6, 0.2, -0.1, 0.0, 0.1, 0.7])
+
+
+def expected(level, slope, steps):
+    """log(1 + chegadas) = nível + tendência + efeito do mês, sem ruído"""
+    return np.expm1(level + slope * steps + SEASON[steps % 12])
+
+
+@pytest.fixture
+def data():
+    steps = np.arange(36)
+    frames = []
+    for uf, level, slope in [('Bahia', 5.0, 0.02), ('Ceará', 3.0, -0.01)]:
+        frames.append(pd.DataFrame({
+            'UF': uf,
+            'País': 'Portugal',
+            'Via de acesso': 'Aérea',
+            'Ano': 2021 + steps // 12,
+            'Mês': [MESES[step % 12] for step in steps],
+            'Chegadas': expected(level, slope, steps)
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.mark.parametrize('n_jobs, block_size', [(1, 4096), (2, 1)])
+def test_forecast_recovers_trend_and_season(data, n_jobs, block_size):
+    model = SeasonalForecaster(horizon=12, n_jobs=n_jobs, block_size=block_size).fit(data)
+
+    steps = np.arange(36, 48)
+    assert model.series['UF'].tolist() == ['Bahia', 'Ceará']
+    np.testing.assert_allclose(model.forecast[:, 0], expected(5.0, 0.02, steps), rtol=1e-6)
+    np.testing.assert_allclose(model.forecast[:, 1], expected(3.0, -0.01, steps), rtol=1e-6)
+    np.testing.assert_allclose(model.rmse, 0, atol=1e-9)
+
+    frame = model.frame({'UF': ['Bahia']})
+    forecast = frame[frame['Tipo'] == 'Previsão']
+    assert forecast['Período'].iloc[0] == pd.Timestamp('2024-01-01')
+    assert forecast['Chegadas'].tolist() == expected(5.0, 0.02, steps).round().tolist()
+
+
+def test_fit_reuses_model_of_same_version(data):
+    forecaster = SeasonalForecaster()
+    model = forecaster.fit(data, version='v1')
+
+    assert forecaster.fit(data, version='v1') is model
+    assert forecaster.fit(data, version='v2') is not model
+    assert forecaster.fit(data) is not forecaster.fit(data)
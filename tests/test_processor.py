@@ -0,0 +1,29 @@
+import pandas as pd
+
+from tourism_analysis.data.processor import DataProcessor
+
+
+def rows(year):
+    return [
+        ('Europa', 'Portugal', 'Bahia', 'Aérea', 'janeiro', year - 2000),
+        ('América', 'Argentina', 'Ceará', 'Terrestre', 'fevereiro', year - 1990),
+        ('Europa', 'França', 'São Paulo', 'Aérea', 'março', 1),
+    ]
+
+
+def test_load_files_serial_and_pool_match_in_year_order(write_year_csv):
+    # Fora de ordem de propósito: o resultado segue o ano, não a ordem de entrada
+    files = {f'CHEGADAS_{year}': write_year_csv(year, rows(year)) for year in (2023, 2021, 2022)}
+    processor = DataProcessor()
+
+    serial = processor.load_files(files, workers=1, chunksize=2)
+    pooled = processor.load_files(files, workers=3)
+
+    assert [(name, year) for name, year, _ in serial] == [
+        ('CHEGADAS_2021', 2021), ('CHEGADAS_2022', 2022), ('CHEGADAS_2023', 2023)
+    ]
+    assert [(name, year) for name, year, _ in pooled] == [(name, year) for name, year, _ in serial]
+    for (_, year, expected), (_, _, result) in zip(serial, pooled):
+        pd.testing.assert_frame_equal(result, expected)
+        assert set(result['Ano']) == {year}
+        assert result['Chegadas'].tolist() == [year - 2000, year - 1990]
@@ -0,0 +1,83 @@
+import gc
+
+import pandas as pd
+import pytest
+
+from tourism_analysis.data.collector import DataCollector
+from tourism_analysis.data.cube import RollupCube
+from tourism_analysis.data.processor import DataProcessor
+from tourism_analysis.data.query import Aggregation, ArrowBackend, ArrowRowReader
+from tourism_analysis.data.store import DatasetStore
+
+
+@pytest.fixture(scope='module')
+def data():
+    return DataProcessor().consolidate_data(DataCollector().generate_sample_data(years=2, records=3_000, seed=3))
+
+
+@pytest.fixture
+def store(tmp_path, data):
+    store = DatasetStore(tmp_path / 'store')
+    store.write(data)
+    return store
+
+
+@pytest.mark.parametrize('keys, filters', [
+    (['UF'], {}),
+    (['Ano', 'Mês'], {'UF': ['Bahia', 'Ceará']}),
+    (['Continente', 'Via de acesso'], {'Ano': (2022, 2022)}),
+    # Faixas em dimensões ordenadas seguem o calendário e a ordem da região, não o texto
+    (['Mês'], {'Mês': ('janeiro', 'março')}),
+    (['UF', 'Mês'], {'UF': ('Bahia', 'Pernambuco'), 'Mês': ('outubro', 'dezembro')}),
+])
+def test_arrow_matches_cube(store, data, keys, filters):
+    query = Aggregation(keys, filters)
+    expected = RollupCube(data).aggregate(query)
+    result = ArrowBackend(store, batch_size=500).aggregate(query)
+    for key in keys:
+        expected[key] = expected[key].astype(str)
+        result[key] = result[key].astype(str)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_snapshot_is_not_affected_by_rewrites(store, data):
+    backend = ArrowBackend(store.snapshot('v1'))
+    reader = ArrowRowReader(store.snapshot('v1'))
+    total = data['Chegadas'].sum()
+
+    store.write(data[data['UF'] == 'Bahia'])
+
+    assert backend.total() == total
+    assert reader.count({}) == len(data)
+    assert ArrowBackend(store).total() == data.loc[data['UF'] == 'Bahia', 'Chegadas'].sum()
+
+
+def test_snapshots_live_while_referenced(store, data):
+    versions = store.root.with_name('store_versions')
+    backend = ArrowBackend(store.snapshot('v1'))
+    assert store.snapshot('v1') is backend.store
+
+    # Versões sem referência saem; a que ainda está em uso continua legível
+    for version in range(2, 6):
+        store.snapshot(f'v{version}')
+    assert len(list(versions.iterdir())) == 1
+    assert backend.total() == data['Chegadas'].sum()
+
+    snapshot = backend.store.root
+    del backend
+    gc.collect()
+    assert not snapshot.exists()
+
+
+def test_row_reader_values_in_batches(store, data):
+    reader = ArrowRowReader(store, batch_size=100)
+    assert reader.values('País') == sorted(data['País'].astype(str).unique())
+    assert reader.values('Ano') == sorted(data['Ano'].unique())
+
+
+def test_row_reader_ranges_follow_category_order(store, data):
+    reader = ArrowRowReader(store)
+    filters = {'Mês': ('janeiro', 'março')}
+    rows = reader.select(filters)
+    assert reader.count(filters) == len(rows) == data['Mês'].isin(['janeiro', 'fevereiro', 'março']).sum()
+    assert set(rows['Mês'].astype(str)) == {'janeiro', 'fevereiro', 'março'}
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+from tourism_analysis.data.collector import DataCollector
+from tourism_analysis.data.manifest import SourceManifest, schema_version
+from tourism_analysis.data.processor import DataProcessor
+from tourism_analysis.data.regions import DEFAULT_CONFIG, RegionRegistry
+from tourism_analysis.data.store import DatasetStore
+
+ROWS = [
+    ('Europa', 'Portugal', 'Bahia', 'Aérea', 'janeiro', 10),
+    ('Europa', 'Portugal', 'São Paulo', 'Aérea', 'fevereiro', 20),
+    ('América', 'Argentina', 'SP', 'Terrestre', 'março', 30),
+    ('América', 'Argentina', 'CE', 'Aérea', 'abril', 40),
+]
+
+
+def test_region_ufs_follow_config_order():
+    assert RegionRegistry('Sul').region_ufs() == ['Paraná', 'Rio Grande do Sul', 'Santa Catarina']
+
+
+def test_unknown_region_is_rejected():
+    with pytest.raises(ValueError, match='Região desconhecida'):
+        RegionRegistry('Atlântida')
+
+
+def test_region_mask_accepts_names_siglas_and_nulls():
+    regions = RegionRegistry('Nordeste')
+    values = pd.Series(['Bahia', 'PE', 'São Paulo', None, 'XX'])
+    assert regions.region_mask(values).tolist() == [True, True, False, False, False]
+    assert regions.region_mask(values.astype('category')).tolist() == [True, True, False, False, False]
+
+
+def test_filter_region_data_converts_siglas_to_names():
+    processor = DataProcessor(regions=RegionRegistry('Sudeste'))
+    result = processor.filter_region_data(pd.DataFrame({'UF': ['SP', 'Bahia', 'São Paulo'], 'Chegadas': [1, 2, 3]}))
+    assert result['UF'].tolist() == ['São Paulo', 'São Paulo']
+
+
+def test_region_change_rebuilds_store(tmp_path, write_year_csv):
+    path = write_year_csv(2022, ROWS)
+    store = DatasetStore(tmp_path / 'store')
+    files = {path.stem: path}
+
+    assert DataProcessor(regions=RegionRegistry('Nordeste')).refresh_store(files, store) == [2022]
+    assert set(store.read()['UF']) == {'Bahia', 'Ceará'}
+
+    # Mesmos arquivos, outra região: o manifesto não pode dar o store como atualizado
+    assert DataProcessor(regions=RegionRegistry('Sudeste')).refresh_store(files, store) == [2022]
+    data = store.read()
+    assert set(data['UF']) == {'São Paulo'}
+    assert data['Chegadas'].sum() == 50
+
+
+def test_stored_dataset_matches_only_its_region(tmp_path, write_year_csv):
+    path = write_year_csv(2022, ROWS)
+    store = DatasetStore(tmp_path / 'store')
+    DataProcessor(regions=RegionRegistry('Nordeste')).refresh_store({path.stem: path}, store)
+
+    # Mesma verificação feita pela aplicação antes de carregar o store na abertura
+    manifest = SourceManifest(store.manifest_path)
+    assert manifest.matches_schema(schema_version('Nordeste'))
+    assert not manifest.matches_schema(schema_version('Sul'))
+    assert not SourceManifest(tmp_path / 'vazio.json').matches_schema(schema_version('Nordeste'))
+
+
+def test_quick_sample_weights_come_from_config(tmp_path):
+    # Outra quantidade de continentes e vias, com pesos parciais na configuração
+    config = DEFAULT_CONFIG.read_text(encoding='utf-8')
+    config = config.replace(
+        'ordem = ["América", "Europa", "Ásia", "Oceania", "África"]', 'ordem = ["América", "Europa", "Ásia"]'
+    ).replace('vias = ["Aérea", "Terrestre", "Marítima"]', 'vias = ["Aérea", "Fluvial"]')
+    path = tmp_path / 'regions.toml'
+    path.write_text(config, encoding='utf-8')
+    regions = RegionRegistry('Nordeste', config_path=path)
+
+    assert regions.sample_weights('pesos_via', ['Aérea', 'Fluvial']).tolist() == [0.5, 0.5]
+    assert regions.sample_weights('pesos_continente', ['América', 'Europa']).tolist() == pytest.approx([4 / 7, 3 / 7])
+
+    data = DataCollector(regions=regions).get_sample_data_quick()['SAMPLE_DATA']
+    assert set(data['Via de acesso']) == {'Aérea', 'Fluvial'}
+    assert set(data['Continente']) == {'América', 'Europa', 'Ásia'}
+    assert data['Ordem via de acesso'].notna().all()
+
+
+def test_filter_northeast_data_is_deprecated_alias():
+    processor = DataProcessor(regions=RegionRegistry('Nordeste'))
+    df = pd.DataFrame({'UF': ['BA', 'São Paulo'], 'Chegadas': [1, 2]})
+    with pytest.warns(DeprecationWarning, match='filter_region_data'):
+        result = processor.filter_northeast_data(df)
+    pd.testing.assert_frame_equal(result, processor.filter_region_data(df))
@@ -0,0 +1,115 @@
+import pandas as pd
+import pytest
+
+from tourism_analysis.data.manifest import SourceManifest
+from tourism_analysis.data.processor import DataProcessor
+from tourism_analysis.data.store import DatasetStore
+
+
+def frame(year, arrivals):
+    return pd.DataFrame({
+        'Ano': [year, year],
+        'UF': ['Bahia', 'Ceará'],
+        'Mês': ['janeiro', 'fevereiro'],
+        'Chegadas': arrivals
+    })
+
+
+def test_write_and_read_roundtrip(tmp_path):
+    store = DatasetStore(tmp_path / 'store')
+    store.write_frames([frame(2021, [1, 2]), frame(2022, [3, 4])])
+
+    data = store.read()
+    assert list(data.columns) == ['Ano', 'UF', 'Mês', 'Chegadas']
+    assert data['Chegadas'].sum() == 10
+    assert store.available_years() == [2021, 2022]
+
+
+def test_failed_stream_keeps_previous_store(tmp_path):
+    store = DatasetStore(tmp_path / 'store')
+    store.write(frame(2021, [1, 2]))
+
+    def frames():
+        yield frame(2022, [3, 4])
+        # Falha de conversão contra o esquema do primeiro bloco
+        yield frame(2023, ['muitos', 'poucos'])
+
+    with pytest.raises(Exception):
+        store.write_frames(frames())
+
+    assert store.read()['Chegadas'].tolist() == [1, 2]
+    # Nenhum diretório temporário fica para trás
+    assert [path.name for path in tmp_path.iterdir()] == ['store']
+
+
+def test_append_after_drop_years(tmp_path):
+    store = DatasetStore(tmp_path / 'store')
+    store.write_frames([frame(2021, [1, 2]), frame(2022, [3, 4])])
+
+    store.drop_years([2022])
+    store.write_frames([frame(2022, [5, 6])], append=True)
+
+    data = store.read().sort_values(['Ano', 'UF'])
+    assert data['Chegadas'].tolist() == [1, 2, 5, 6]
+
+
+def country_rows(count, total=400):
+    return [
+        ('Europa', f'País {i % count}', 'Bahia', 'Aérea', 'janeiro', 1)
+        for i in range(total)
+    ]
+
+
+def test_categories_growing_across_chunks(tmp_path, write_year_csv):
+    # Primeiro bloco com 3 países, segundo com mais de 128 (índice int8 no pandas)
+    path = write_year_csv(2021, country_rows(3, 100) + country_rows(300))
+    store = DatasetStore(tmp_path / 'store')
+
+    rows = DataProcessor().consolidate_files({'CHEGADAS_2021': path}, store, chunksize=100)
+
+    data = store.read()
+    assert rows == len(data) == 500
+    assert data['País'].nunique() == 300
+
+
+def test_categories_growing_across_years(tmp_path, write_year_csv):
+    files = {
+        'CHEGADAS_2021': write_year_csv(2021, country_rows(3)),
+        'CHEGADAS_2022': write_year_csv(2022, country_rows(300)),
+    }
+    processor = DataProcessor()
+    store = DatasetStore(tmp_path / 'store')
+
+    processor.refresh_store({'CHEGADAS_2021': files['CHEGADAS_2021']}, store)
+    processor.refresh_store(files, store)
+
+    data = store.read()
+    assert data.groupby('Ano')['País'].nunique().to_dict() == {2021: 3, 2022: 300}
+
+
+def test_streamed_refresh_matches_pool(tmp_path, write_year_csv):
+    files = {
+        'CHEGADAS_2021': write_year_csv(2021, country_rows(3)),
+        'CHEGADAS_2022': write_year_csv(2022, country_rows(300)),
+    }
+    serial, pooled = DatasetStore(tmp_path / 'serial'), DatasetStore(tmp_path / 'pool')
+    sizes = []
+    write_frames = serial.write_frames
+
+    def record(frames, append=False):
+        return write_frames((sizes.append(len(frame)) or frame for frame in frames), append)
+
+    serial.write_frames = record
+    DataProcessor().refresh_store(files, serial, chunksize=150)
+    # Sem workers extras, o store recebe os blocos do CSV, não o ano inteiro
+    assert max(sizes) == 150
+    DataProcessor().refresh_store(files, pooled, workers=2)
+
+    key = ['Ano', 'País']
+    expected = pooled.read().astype({'País': str}).sort_values(key, ignore_index=True)
+    result = serial.read().astype({'País': str}).sort_values(key, ignore_index=True)
+    pd.testing.assert_frame_equal(result, expected)
+    manifest = SourceManifest(serial.manifest_path)
+    assert {name: entry['rows'] for name, entry in manifest.sources.items()} == {
+        'CHEGADAS_2021': 400, 'CHEGADAS_2022': 400
+    }